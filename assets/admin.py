@@ -1,5 +1,16 @@
 from django.contrib import admin
 
 from .models import Asset
+from .versions import bump_asset_version
 
-admin.site.register(Asset)
+
+@admin.register(Asset)
+class AssetAdmin(admin.ModelAdmin):
+    def delete_queryset(self, request, queryset):
+        # The delete action deletes a queryset, which skips Asset.delete()
+        user_ids = set(queryset.values_list("user_id", flat=True))
+
+        super().delete_queryset(request, queryset)
+
+        for user_id in user_ids:
+            bump_asset_version(user_id)
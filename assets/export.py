@@ -0,0 +1,71 @@
+import csv
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Asset
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = ("user_id", "crypto_name", "abbreviation", "amount", "updated_at")
+
+# Rows fetched from the database at once while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_holdings(export_format, crypto_id=None, updated_since=None):
+    """
+    Yields all holdings, optionally filtered by crypto and last update, as lines of
+    NDJSON or CSV. Rows are fetched in chunks (with a server-side cursor where the
+    database supports it), so memory use does not depend on the number of holdings.
+    """
+    queryset = Asset.objects.order_by("id").values_list(
+        "user_id", "crypto__name", "crypto__abbreviation", "amount", "updated_at"
+    )
+
+    if crypto_id is not None:
+        queryset = queryset.filter(crypto_id=crypto_id)
+
+    if updated_since is not None:
+        queryset = queryset.filter(updated_at__gte=updated_since)
+
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if export_format == "csv":
+        return _csv_lines(rows)
+
+    return _ndjson_lines(rows)
+
+
+async def aiterate_export(lines, batch_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the lines of an export in batches, each one pulled in the sync thread that
+    holds the database cursor. Under ASGI, StreamingHttpResponse reads a sync iterator
+    into memory before sending it, so exports are streamed through this one there.
+    """
+
+    def next_batch():
+        return "".join(itertools.islice(lines, batch_size))
+
+    while batch := await sync_to_async(next_batch)():
+        yield batch
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+class _LineBuffer:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_LineBuffer())
+
+    yield writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        yield writer.writerow(row[:-1] + (row[-1].isoformat(),))
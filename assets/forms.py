@@ -3,3 +3,26 @@ from django import forms
 
 class AssetCreateUpdateForm(forms.Form):
     amount = forms.FloatField()
+
+
+class AssetBulkOperationForm(forms.Form):
+    MODE_ADD = "add"
+    MODE_SET = "set"
+    MODE_DELETE = "delete"
+
+    crypto = forms.CharField()
+    amount = forms.FloatField(required=False)
+    mode = forms.ChoiceField(
+        choices=[(mode, mode) for mode in (MODE_ADD, MODE_SET, MODE_DELETE)]
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        if (
+            cleaned_data.get("mode") in (self.MODE_ADD, self.MODE_SET)
+            and cleaned_data.get("amount") is None
+        ):
+            self.add_error("amount", "This field is required.")
+
+        return cleaned_data
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from assets.export import EXPORT_FORMATS, export_holdings
+from crypto_assets_server.dates import parse_aware_datetime
+from cryptos.registry import crypto_registry
+
+
+class Command(BaseCommand):
+    help = "Streams the holdings of all users as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument("--crypto", help="Only export holdings of this crypto")
+        parser.add_argument(
+            "--updated-since",
+            help="Only export holdings updated at or after this ISO 8601 datetime",
+        )
+        parser.add_argument(
+            "--output", help="File to write the export to instead of stdout"
+        )
+
+    def handle(self, *args, **options):
+        crypto_id = None
+        if options["crypto"] is not None:
+            crypto = crypto_registry.get(options["crypto"])
+            if crypto is None:
+                raise CommandError(f"Crypto {options['crypto']} not found")
+
+            crypto_id = crypto.id
+
+        try:
+            updated_since = parse_aware_datetime(options["updated_since"])
+        except ValueError:
+            raise CommandError("--updated-since must be an ISO 8601 datetime")
+
+        lines = export_holdings(options["format"], crypto_id, updated_since)
+
+        if options["output"] is None:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as file:
+            file.writelines(lines)
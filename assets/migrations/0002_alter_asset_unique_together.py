@@ -0,0 +1,44 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:15
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_assets(apps, schema_editor):
+    """
+    Merges assets of the same crypto and user, which the racy get_or_create() of
+    earlier versions could create, into the oldest one by summing their amounts.
+    """
+    Asset = apps.get_model("assets", "Asset")
+    duplicates = (
+        Asset.objects.values("crypto_id", "user_id")
+        .annotate(count=Count("id"), first_id=Min("id"))
+        .filter(count__gt=1)
+    )
+
+    for duplicate in duplicates:
+        assets = Asset.objects.filter(
+            crypto_id=duplicate["crypto_id"], user_id=duplicate["user_id"]
+        )
+        amount = sum(asset.amount for asset in assets)
+
+        Asset.objects.filter(id=duplicate["first_id"]).update(amount=amount)
+        assets.exclude(id=duplicate["first_id"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryptos", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("assets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_assets, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="asset",
+            unique_together={("crypto", "user")},
+        ),
+    ]
@@ -1,13 +1,109 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 
 from cryptos.models import Crypto
+from .versions import bump_asset_version
+
+# Rows per INSERT statement, keeps the number of query parameters below the limits of
+# older SQLite versions
+UPSERT_BATCH_SIZE = 200
+
+
+class AssetManager(models.Manager):
+    def upsert_amount(self, user_id, crypto_id, amount, increment=False):
+        """
+        Sets the amount of the asset, or adds to it if `increment` is set, creating the
+        asset if it does not exist yet. Runs as a single atomic INSERT ... ON CONFLICT
+        statement and returns the new amount.
+        """
+        return self.upsert_amounts(user_id, {crypto_id: amount}, increment)[crypto_id]
+
+    async def aupsert_amount(self, user_id, crypto_id, amount, increment=False):
+        # Raw SQL has no async interface, like Django's own async ORM methods in 4.2
+        return await sync_to_async(self.upsert_amount)(
+            user_id, crypto_id, amount, increment
+        )
+
+    def upsert_amounts(self, user_id, amounts, increment=False):
+        """
+        Like upsert_amount() for a dict mapping crypto ids to amounts, using one
+        multi-row statement per UPSERT_BATCH_SIZE assets. Returns a dict mapping the
+        crypto ids to the new amounts.
+        """
+        opts = self.model._meta
+        quote = connection.ops.quote_name
+        table = quote(opts.db_table)
+        crypto_column = quote(opts.get_field("crypto").column)
+        user_column = quote(opts.get_field("user").column)
+        amount_column = quote(opts.get_field("amount").column)
+        updated_at_column = quote(opts.get_field("updated_at").column)
+
+        if increment:
+            new_amount = f"{table}.{amount_column} + excluded.{amount_column}"
+        else:
+            new_amount = f"excluded.{amount_column}"
+
+        updated_at = timezone.now()
+
+        items = list(amounts.items())
+        new_amounts = {}
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), UPSERT_BATCH_SIZE):
+                batch = items[start : start + UPSERT_BATCH_SIZE]
+
+                sql = (
+                    f"INSERT INTO {table} ({crypto_column}, {user_column}, "
+                    f"{amount_column}, {updated_at_column}) "
+                    f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(batch))} "
+                    f"ON CONFLICT ({crypto_column}, {user_column}) "
+                    f"DO UPDATE SET {amount_column} = {new_amount}, "
+                    f"{updated_at_column} = excluded.{updated_at_column} "
+                    f"RETURNING {crypto_column}, {amount_column}"
+                )
+                params = [
+                    value
+                    for crypto_id, amount in batch
+                    for value in (
+                        crypto_id,
+                        user_id,
+                        amount,
+                        connection.ops.adapt_datetimefield_value(updated_at),
+                    )
+                ]
+
+                cursor.execute(sql, params)
+                # SQLite returns the value before REAL affinity is applied, so a whole
+                # number comes back as int
+                new_amounts.update(
+                    (crypto_id, float(amount))
+                    for crypto_id, amount in cursor.fetchall()
+                )
+
+        return new_amounts
 
 
 class Asset(models.Model):
     crypto = models.ForeignKey(Crypto, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     amount = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = AssetManager()
 
     class Meta:
         unique_together = ("crypto", "user")
+
+    # The API writes with upserts and queryset deletes, and bumps the asset version
+    # itself. Deleting a queryset therefore skips delete() and stays a single query.
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_asset_version(self.user_id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_asset_version(self.user_id)
+
+        return result
@@ -0,0 +1,160 @@
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.urls import reverse
+import json
+
+from assets.models import Asset
+from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
+
+
+class BulkUpdateAssetsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        self.ethereum = Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+        self.cardano = Crypto.objects.create(
+            name="cardano", abbreviation="ADA", iconurl="https://test.com/test3.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _bulk_update(self, operations, user_id=None):
+        response = self.client.patch(
+            reverse("list-assets", kwargs={"user_id": user_id or self.user.id}),
+            data=json.dumps(operations),
+            content_type="application/json",
+        )
+
+        return response
+
+    def _amounts(self):
+        return dict(
+            Asset.objects.filter(user=self.user).values_list("crypto__name", "amount")
+        )
+
+    def test_bulk_update_assets(self):
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1)
+        Asset.objects.create(crypto=self.ethereum, user=self.user, amount=2)
+        Asset.objects.create(crypto=self.cardano, user=self.user, amount=3)
+
+        response = self._bulk_update(
+            [
+                {"crypto": "bitcoin", "amount": 1.5, "mode": "add"},
+                {"crypto": "ethereum", "amount": 5, "mode": "set"},
+                {"crypto": "cardano", "mode": "delete"},
+            ]
+        )
+
+        expected_json = {
+            "message": "Successfully applied 3 operations",
+            "assets": [
+                {"crypto": "bitcoin", "new_amount": 2.5},
+                {"crypto": "ethereum", "new_amount": 5.0},
+            ],
+            "deleted": 1,
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertDictEqual(response.json(), expected_json)
+        self.assertDictEqual(self._amounts(), {"bitcoin": 2.5, "ethereum": 5.0})
+
+    def test_bulk_update_creates_missing_assets(self):
+        response = self._bulk_update(
+            [
+                {"crypto": "bitcoin", "amount": 1, "mode": "add"},
+                {"crypto": "ethereum", "amount": 2, "mode": "set"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(self._amounts(), {"bitcoin": 1.0, "ethereum": 2.0})
+
+    def test_bulk_update_query_count_does_not_depend_on_number_of_operations(self):
+        cryptos = [
+            Crypto.objects.create(
+                name=f"crypto{i}",
+                abbreviation=f"C{i}",
+                iconurl=f"https://test.com/c{i}.png",
+            )
+            for i in range(200)
+        ]
+        operations = [
+            {"crypto": crypto.name, "amount": 1, "mode": mode}
+            for crypto, mode in zip(cryptos, ["add", "set", "delete"] * 67)
+        ]
+
+        crypto_registry.all()
+
+        # Session and user lookup, savepoint, INSERT for add, INSERT for set, DELETE
+        # and savepoint release
+        with self.assertNumQueries(7):
+            response = self._bulk_update(operations)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Asset.objects.filter(user=self.user).count(), 134)
+
+    def test_bulk_update_is_atomic(self):
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1)
+
+        response = self._bulk_update(
+            [
+                {"crypto": "bitcoin", "amount": 1, "mode": "add"},
+                {"crypto": "unsupported_crypto", "amount": 1, "mode": "add"},
+            ]
+        )
+
+        self.assertContains(response, "error", status_code=404)
+        self.assertDictEqual(self._amounts(), {"bitcoin": 1.0})
+
+    def test_bulk_update_fails_for_invalid_operations(self):
+        test_cases = [
+            [{"crypto": "bitcoin", "amount": "invalid_value", "mode": "add"}],
+            [{"crypto": "bitcoin", "amount": 1, "mode": "invalid_mode"}],
+            [{"crypto": "bitcoin", "mode": "set"}],
+            [
+                {"crypto": "bitcoin", "amount": 1, "mode": "add"},
+                {"crypto": "bitcoin", "amount": 1, "mode": "set"},
+            ],
+            ["invalid_operation"],
+            [],
+            {"crypto": "bitcoin", "amount": 1, "mode": "add"},
+        ]
+
+        for operations in test_cases:
+            response = self._bulk_update(operations)
+
+            self.assertContains(response, "error", status_code=400)
+            self.assertEqual(response["Content-Type"], "application/json")
+
+        self.assertDictEqual(self._amounts(), {})
+
+    def test_bulk_update_fails_for_invalid_json(self):
+        response = self.client.patch(
+            reverse("list-assets", kwargs={"user_id": self.user.id}),
+            data="invalid",
+            content_type="application/json",
+        )
+
+        self.assertContains(response, "error", status_code=400)
+
+    def test_user_cannot_bulk_update_assets_of_other_users(self):
+        another_user = User.objects.create_user(
+            username="new_user", password="Test1234", email="new_user@test.com"
+        )
+
+        response = self._bulk_update(
+            [{"crypto": "bitcoin", "amount": 1, "mode": "add"}], user_id=another_user.id
+        )
+
+        self.assertContains(response, "error", status_code=403)
+        self.assertEqual(response["Content-Type"], "application/json")
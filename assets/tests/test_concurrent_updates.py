@@ -0,0 +1,57 @@
+import json
+import threading
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+
+from assets.models import Asset
+from cryptos.models import Crypto
+
+
+class ConcurrentAssetUpdatesTestCase(TransactionTestCase):
+    def setUp(self):
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+
+    def _increase_amount(self, times, errors):
+        client = Client()
+        client.force_login(self.user)
+
+        try:
+            for _ in range(times):
+                response = client.post(
+                    reverse(
+                        "manage-assets",
+                        kwargs={"user_id": self.user.id, "crypto": "bitcoin"},
+                    ),
+                    data=json.dumps({"amount": 1}),
+                    content_type="application/json",
+                )
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_concurrent_increments_are_not_lost(self):
+        errors = []
+        threads = [
+            threading.Thread(target=self._increase_amount, args=(10, errors))
+            for _ in range(5)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(errors, [])
+
+        asset = Asset.objects.get(user=self.user, crypto__name="bitcoin")
+
+        self.assertEqual(asset.amount, 50)
@@ -5,6 +5,7 @@ import json
 
 from assets.models import Asset
 from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
 
 
 class CreateAssetTestCase(TestCase):
@@ -19,6 +20,7 @@ class CreateAssetTestCase(TestCase):
             username="test", password="Test1234", email="test@test.com"
         )
         self.client.login(username=self.user.username, password="Test1234")
+        self.async_client.force_login(self.user)
 
     def _create_asset(self, crypto_name, request_data):
         response = self.client.post(
@@ -72,6 +74,27 @@ class CreateAssetTestCase(TestCase):
 
         self.assertEqual(asset.amount, 2.5)
 
+    def test_whole_new_amount_is_returned_as_float(self):
+        crypto = Crypto.objects.get(name="bitcoin")
+        Asset.objects.create(crypto=crypto, user=self.user, amount=1)
+
+        response = self._create_asset("bitcoin", {"amount": 1})
+
+        self.assertIsInstance(response.json()["new_amount"], float)
+        self.assertIn(b'"new_amount": 2.0', response.content)
+
+    def test_increase_amount_runs_a_single_upsert_statement(self):
+        crypto = Crypto.objects.get(name="bitcoin")
+        Asset.objects.create(crypto=crypto, user=self.user, amount=1)
+
+        crypto_registry.all()
+
+        # Session and user lookup, then one INSERT ... ON CONFLICT
+        with self.assertNumQueries(3):
+            response = self._create_asset("bitcoin", {"amount": 1.5})
+
+        self.assertEqual(response.json()["new_amount"], 2.5)
+
     def test_create_asset_fails_for_invalid_request_data(self):
         test_cases = [
             {"amount": "invalid_value"},
@@ -135,3 +158,18 @@ class CreateAssetTestCase(TestCase):
 
         self.assertContains(response, "error", status_code=403)
         self.assertEqual(response["Content-Type"], "application/json")
+
+    async def test_create_new_asset_in_async_request(self):
+        response = await self.async_client.post(
+            reverse(
+                "manage-assets", kwargs={"user_id": self.user.id, "crypto": "bitcoin"}
+            ),
+            data=json.dumps({"amount": 1.5}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["new_amount"], 1.5)
+        self.assertTrue(
+            await Asset.objects.filter(user=self.user, crypto__name="bitcoin").aexists()
+        )
@@ -4,6 +4,7 @@ from django.urls import reverse
 
 from assets.models import Asset
 from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
 
 
 class DeleteAssetTestCase(TestCase):
@@ -41,6 +42,15 @@ class DeleteAssetTestCase(TestCase):
         with self.assertRaises(Asset.DoesNotExist):
             Asset.objects.get(user=self.user, crypto__name="bitcoin")
 
+    def test_delete_asset_runs_a_single_delete_statement(self):
+        crypto_registry.all()
+
+        # Session and user lookup, then one DELETE
+        with self.assertNumQueries(3):
+            response = self._delete_asset()
+
+        self.assertEqual(response.status_code, 200)
+
     def test_delete_fails_for_non_existing_asset(self):
         self.asset.delete()
 
@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import warnings
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from assets.models import Asset
+from cryptos.models import Crypto
+
+
+class ExportHoldingsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        self.ethereum = Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com", is_staff=True
+        )
+        self.other_user = User.objects.create_user(
+            username="test2", password="Test1234", email="test2@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1.5)
+        Asset.objects.create(crypto=self.ethereum, user=self.user, amount=2)
+        Asset.objects.create(crypto=self.bitcoin, user=self.other_user, amount=3)
+
+    def _export(self, **params):
+        return self.client.get(reverse("export-assets"), params)
+
+    def _ndjson(self, response):
+        content = b"".join(response.streaming_content).decode()
+
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_holdings_as_ndjson(self):
+        response = self._export()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertTrue(response.streaming)
+
+        rows = self._ndjson(response)
+        self.assertEqual(
+            [(row["user_id"], row["crypto_name"], row["amount"]) for row in rows],
+            [
+                (self.user.id, "bitcoin", 1.5),
+                (self.user.id, "ethereum", 2.0),
+                (self.other_user.id, "bitcoin", 3.0),
+            ],
+        )
+        self.assertEqual(rows[0]["abbreviation"], "BTC")
+        self.assertIn("updated_at", rows[0])
+
+    def test_export_holdings_as_csv(self):
+        response = self._export(format="csv")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+
+        self.assertEqual(
+            rows[0], ["user_id", "crypto_name", "abbreviation", "amount", "updated_at"]
+        )
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][:4], [str(self.user.id), "bitcoin", "BTC", "1.5"])
+
+    async def test_export_holdings_under_asgi(self):
+        response = await self.async_client.get(
+            reverse("export-assets"), {"format": "csv"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        # A sync iterator would be read into memory before the response is sent
+        self.assertTrue(response.is_async)
+
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        rows = list(csv.reader(io.StringIO(content.decode())))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            rows[3][:4], [str(self.other_user.id), "bitcoin", "BTC", "3.0"]
+        )
+
+    def test_export_holdings_of_crypto(self):
+        rows = self._ndjson(self._export(crypto="bitcoin"))
+
+        self.assertEqual([row["crypto_name"] for row in rows], ["bitcoin", "bitcoin"])
+
+    def test_export_holdings_updated_since(self):
+        Asset.objects.filter(crypto=self.ethereum).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        rows = self._ndjson(self._export(updated_since=since))
+
+        self.assertEqual([row["crypto_name"] for row in rows], ["bitcoin", "bitcoin"])
+
+    def test_export_holdings_of_unknown_crypto(self):
+        response = self._export(crypto="unknown")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"error": "Crypto unknown not found"})
+
+    def test_export_holdings_with_invalid_parameters(self):
+        self.assertEqual(self._export(format="xml").status_code, 400)
+        self.assertEqual(self._export(updated_since="yesterday").status_code, 400)
+        self.assertEqual(
+            self._export(updated_since="2024-13-45T00:00:00").status_code, 400
+        )
+
+    def test_export_holdings_updated_since_naive_datetime(self):
+        Asset.objects.filter(crypto=self.ethereum).update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+        since = (timezone.now() - timedelta(days=1)).replace(tzinfo=None)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            rows = self._ndjson(self._export(updated_since=since.isoformat()))
+
+        self.assertEqual([row["crypto_name"] for row in rows], ["bitcoin", "bitcoin"])
+
+    def test_non_staff_user_cannot_export_holdings(self):
+        self.client.login(username=self.other_user.username, password="Test1234")
+
+        response = self._export()
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_holdings_requires_login(self):
+        self.client.logout()
+
+        response = self._export()
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_export_holdings_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "holdings.csv")
+
+            call_command("export_holdings", "--format=csv", f"--output={path}")
+
+            with open(path, newline="") as file:
+                rows = list(csv.reader(file))
+
+        self.assertEqual(len(rows), 4)
+
+    def test_export_holdings_command_to_stdout(self):
+        stdout = io.StringIO()
+
+        call_command("export_holdings", "--crypto=ethereum", stdout=stdout)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([row["crypto_name"] for row in rows], ["ethereum"])
+
+    def test_export_holdings_command_with_unknown_crypto(self):
+        with self.assertRaises(CommandError):
+            call_command("export_holdings", "--crypto=unknown")
+
+    def test_export_holdings_command_with_invalid_datetime(self):
+        with self.assertRaises(CommandError):
+            call_command("export_holdings", "--updated-since=2024-13-45T00:00:00")
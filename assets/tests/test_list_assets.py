@@ -1,9 +1,11 @@
 from django.contrib.auth.models import User
 from django.test import Client, TestCase
 from django.urls import reverse
+import json
 
 from assets.models import Asset
 from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
 
 
 class ListAssetsTestCase(TestCase):
@@ -21,6 +23,7 @@ class ListAssetsTestCase(TestCase):
             username="test", password="Test1234", email="test@test.com"
         )
         self.client.login(username=self.user.username, password="Test1234")
+        self.async_client.force_login(self.user)
 
         bitcoin = Crypto.objects.get(name="bitcoin")
         Asset.objects.create(user=self.user, crypto=bitcoin, amount=10.5)
@@ -57,6 +60,104 @@ class ListAssetsTestCase(TestCase):
 
         self.assertListEqual(assets, expected_assets)
 
+    def test_list_assets_query_count_does_not_depend_on_number_of_assets(self):
+        url = reverse("list-assets", kwargs={"user_id": self.user.id})
+        crypto_registry.all()
+
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        for i in range(10):
+            crypto = Crypto.objects.create(
+                name=f"crypto{i}",
+                abbreviation=f"C{i}",
+                iconurl=f"https://test.com/c{i}.png",
+            )
+            Asset.objects.create(user=self.user, crypto=crypto, amount=i)
+
+        crypto_registry.all()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.json()["assets"]), 12)
+
+    def test_list_assets_returns_not_modified_for_matching_etag(self):
+        url = reverse("list-assets", kwargs={"user_id": self.user.id})
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        # Session and user lookup only, the assets are not queried
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_list_assets_etag_changes_when_assets_are_written(self):
+        url = reverse("list-assets", kwargs={"user_id": self.user.id})
+        etag = self.client.get(url)["ETag"]
+
+        self.client.post(
+            reverse(
+                "manage-assets", kwargs={"user_id": self.user.id, "crypto": "bitcoin"}
+            ),
+            data=json.dumps({"amount": 1}),
+            content_type="application/json",
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["assets"][0]["amount"], 11.5)
+
+    def test_list_assets_etag_changes_when_assets_are_written_outside_the_api(self):
+        url = reverse("list-assets", kwargs={"user_id": self.user.id})
+        etag = self.client.get(url)["ETag"]
+
+        # Like an edit in the admin
+        asset = Asset.objects.get(user=self.user, crypto__name="bitcoin")
+        asset.amount = 2
+        asset.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assets"][0]["amount"], 2.0)
+
+        etag = response["ETag"]
+        asset.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["assets"]), 1)
+
+    def test_list_assets_etag_changes_when_assets_are_deleted_in_the_admin(self):
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+
+        url = reverse("list-assets", kwargs={"user_id": self.user.id})
+        etag = self.client.get(url)["ETag"]
+
+        self.client.post(
+            reverse("admin:assets_asset_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [
+                    asset.id for asset in Asset.objects.filter(user=self.user)
+                ],
+                "post": "yes",
+            },
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assets"], [])
+
     def test_list_assets_with_empty_result(self):
         Asset.objects.all().delete()
         response = self.client.get(
@@ -93,11 +194,33 @@ class ListAssetsTestCase(TestCase):
         self.assertContains(response, "error", status_code=403)
         self.assertEqual(response["Content-Type"], "application/json")
 
-    def test_list_assets_only_allows_get_requests(self):
-        http_methods = ["post", "patch", "put", "delete"]
+    def test_list_assets_only_allows_get_and_patch_requests(self):
+        http_methods = ["post", "put", "delete"]
 
         for method in http_methods:
             response = self.client.generic(
                 method, reverse("list-assets", kwargs={"user_id": self.user.id})
             )
             self.assertEqual(response.status_code, 405)
+
+    async def test_list_assets_in_async_request(self):
+        response = await self.async_client.get(
+            reverse("list-assets", kwargs={"user_id": self.user.id})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["assets"]), 2)
+
+        response = await self.async_client.get(
+            reverse("list-assets", kwargs={"user_id": self.user.id}),
+            headers={"If-None-Match": response["ETag"]},
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    async def test_user_cannot_list_assets_of_other_users_in_async_request(self):
+        response = await self.async_client.get(
+            reverse("list-assets", kwargs={"user_id": self.user.id + 1})
+        )
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,159 @@
+from datetime import timedelta
+from unittest.mock import patch
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from assets.models import Asset
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto, PriceSnapshot
+
+
+class PortfolioTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        self.ethereum = Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+        self.cardano = Crypto.objects.create(
+            name="cardano", abbreviation="ADA", iconurl="https://test.com/test3.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _get_portfolio(self, user_id):
+        response = self.client.get(reverse("portfolio", kwargs={"user_id": user_id}))
+
+        return response
+
+    def _mock_tickers(self, mock_request, tickers):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = [
+            {"symbol": symbol, "price": price} for symbol, price in tickers.items()
+        ]
+
+    @patch("requests.Session.get")
+    def test_get_portfolio(self, mock_request):
+        self._mock_tickers(mock_request, {"BTCEUR": "1000", "ETHEUR": "100"})
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1.5)
+        Asset.objects.create(crypto=self.ethereum, user=self.user, amount=5)
+
+        response = self._get_portfolio(self.user.id)
+
+        expected_json = {
+            "user_id": self.user.id,
+            "assets": [
+                {
+                    "crypto_name": "bitcoin",
+                    "abbreviation": "BTC",
+                    "amount": 1.5,
+                    "price": "1000",
+                    "value": "1500.00",
+                    "allocation": 75.0,
+                },
+                {
+                    "crypto_name": "ethereum",
+                    "abbreviation": "ETH",
+                    "amount": 5.0,
+                    "price": "100",
+                    "value": "500.00",
+                    "allocation": 25.0,
+                },
+            ],
+            "total_value": "2000.00",
+            "unit": "EUR",
+            "stale": False,
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertDictEqual(response.json(), expected_json)
+        mock_request.assert_called_once()
+
+    @patch("requests.Session.get")
+    def test_query_count_does_not_depend_on_number_of_assets(self, mock_request):
+        self._mock_tickers(
+            mock_request, {"BTCEUR": "1000", "ETHEUR": "100", "ADAEUR": "1"}
+        )
+
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1)
+        with self.assertNumQueries(3):
+            self._get_portfolio(self.user.id)
+
+        cache.clear()
+        Asset.objects.create(crypto=self.ethereum, user=self.user, amount=1)
+        Asset.objects.create(crypto=self.cardano, user=self.user, amount=1)
+        with self.assertNumQueries(3):
+            self._get_portfolio(self.user.id)
+
+    def test_get_empty_portfolio(self):
+        response = self._get_portfolio(self.user.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["assets"], [])
+        self.assertEqual(response.json()["total_value"], "0.00")
+
+    @patch("requests.Session.get")
+    def test_get_portfolio_fails_for_timeout(self, mock_request):
+        mock_request.side_effect = requests.Timeout()
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=1)
+
+        response = self._get_portfolio(self.user.id)
+
+        self.assertContains(response, "error", status_code=504)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @override_settings(PRICE_SOURCE="snapshot")
+    @patch("requests.Session.get")
+    def test_get_portfolio_from_snapshots(self, mock_request):
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=2)
+        PriceSnapshot.objects.create(
+            crypto=self.bitcoin,
+            price="1000",
+            fetched_at=timezone.now() - timedelta(seconds=5),
+        )
+
+        with self.assertNumQueries(3):
+            response = self._get_portfolio(self.user.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_value"], "2000.00")
+        mock_request.assert_not_called()
+
+    @override_settings(PRICE_SOURCE="snapshot")
+    def test_get_portfolio_fails_if_snapshot_is_missing(self):
+        Asset.objects.create(crypto=self.bitcoin, user=self.user, amount=2)
+
+        response = self._get_portfolio(self.user.id)
+
+        self.assertContains(response, "error", status_code=503)
+
+    def test_get_portfolio_fails_if_user_not_logged_in(self):
+        self.client.logout()
+
+        response = self._get_portfolio(self.user.id)
+
+        self.assertContains(response, "error", status_code=401)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_user_cannot_get_portfolio_of_other_users(self):
+        another_user = User.objects.create_user(
+            username="new_user", password="Test1234", email="new_user@test.com"
+        )
+
+        response = self._get_portfolio(another_user.id)
+
+        self.assertContains(response, "error", status_code=403)
+        self.assertEqual(response["Content-Type"], "application/json")
@@ -1,12 +1,19 @@
 from django.urls import path
 
-from .views import AssetListView, AssetManagementView
+from .views import (
+    AssetListView,
+    AssetManagementView,
+    HoldingsExportView,
+    PortfolioView,
+)
 
 urlpatterns = [
     path("users/<int:user_id>/assets", AssetListView.as_view(), name="list-assets"),
+    path("users/<int:user_id>/portfolio", PortfolioView.as_view(), name="portfolio"),
     path(
         "users/<int:user_id>/assets/<str:crypto>",
         AssetManagementView.as_view(),
         name="manage-assets",
     ),
+    path("export/assets", HoldingsExportView.as_view(), name="export-assets"),
 ]
@@ -0,0 +1,43 @@
+import uuid
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+ASSET_VERSION_KEY_PREFIX = "assets:version"
+
+
+async def aget_asset_version(user_id):
+    """
+    Returns a stamp that changes whenever the assets of the given user are written.
+    """
+    key = _asset_version_key(user_id)
+
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+        version = await cache.aget(key)
+
+    return version
+
+
+async def abump_asset_version(user_id):
+    await cache.aset(_asset_version_key(user_id), uuid.uuid4().hex, timeout=None)
+
+
+def bump_asset_version(user_id):
+    """
+    Changes the asset version of the given user for writes outside of the API, e.g. in
+    the admin. The version is changed again once the write is committed, as other
+    processes may cache the old list in between.
+    """
+    _set_asset_version(user_id)
+    transaction.on_commit(partial(_set_asset_version, user_id))
+
+
+def _set_asset_version(user_id):
+    cache.set(_asset_version_key(user_id), uuid.uuid4().hex, timeout=None)
+
+
+def _asset_version_key(user_id):
+    return f"{ASSET_VERSION_KEY_PREFIX}:{user_id}"
@@ -1,50 +1,276 @@
 import json
-from django.http import JsonResponse
+from collections import Counter
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views import View
 
-from cryptos.models import Crypto
+from cryptos.errors import NoPriceSnapshotErrorResponse, PriceErrorResponse
+from cryptos.prices import PRICE_UNIT, Price, get_prices, price_symbol
+from cryptos.providers import PriceFetchError
+from cryptos.registry import crypto_registry
+from crypto_assets_server.dates import parse_aware_datetime
+from crypto_assets_server.decorators import async_condition
 from crypto_assets_server.errors import InvalidJsonErrorResponse
 from crypto_assets_server.mixins import CustomLoginRequiredMixin
+from crypto_assets_server.mixins import StaffRequiredMixin
 from crypto_assets_server.mixins import UserAccessOwnResourcesMixin
 from .models import Asset
-from .forms import AssetCreateUpdateForm
+from .versions import abump_asset_version, aget_asset_version
+from .export import EXPORT_FORMATS, aiterate_export, export_holdings
+from .forms import AssetBulkOperationForm, AssetCreateUpdateForm
+
+CENT = Decimal("0.01")
+
+MAX_BULK_OPERATIONS = 1000
+
+EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _asset_list_etag(request, *args, **kwargs):
+    # The list contains crypto attributes, so it also changes with the catalog
+    asset_version = await aget_asset_version(request.user.id)
+
+    return f"assets-{asset_version}-{await crypto_registry.aversion()}"
 
 
 class AssetListView(CustomLoginRequiredMixin, UserAccessOwnResourcesMixin, View):
-    def get(self, request, *args, **kwargs):
-        queryset = Asset.objects.filter(user=request.user)
-        assets = []
+    query_budget = {"GET": 4, "PATCH": 8}
 
-        for asset in queryset:
-            assets.append(
-                {
-                    "crypto_name": asset.crypto.name,
-                    "user_id": asset.user.id,
-                    "amount": asset.amount,
-                    "abbreviation": asset.crypto.abbreviation,
-                    "iconurl": asset.crypto.iconurl,
-                }
+    @async_condition(etag_func=_asset_list_etag)
+    async def get(self, request, *args, **kwargs):
+        queryset = (
+            Asset.objects.filter(user_id=request.user.id)
+            .order_by("id")
+            .values(
+                "user_id",
+                "amount",
+                crypto_name=F("crypto__name"),
+                abbreviation=F("crypto__abbreviation"),
+                iconurl=F("crypto__iconurl"),
             )
+        )
+        assets = [asset async for asset in queryset]
 
         return JsonResponse({"assets": assets})
 
+    async def patch(self, request, *args, **kwargs):
+        operations, err = self._validate_and_return_operations(request.body)
+        if err is not None:
+            return err
+
+        cryptos = [
+            await crypto_registry.aget(operation["crypto"]) for operation in operations
+        ]
+
+        unsupported = [
+            operation["crypto"]
+            for operation, crypto in zip(operations, cryptos)
+            if crypto is None
+        ]
+        if unsupported:
+            return JsonResponse(
+                {"error": f"Cryptos {', '.join(unsupported)} not found"}, status=404
+            )
+
+        amounts = {
+            AssetBulkOperationForm.MODE_ADD: {},
+            AssetBulkOperationForm.MODE_SET: {},
+            AssetBulkOperationForm.MODE_DELETE: {},
+        }
+        for operation, crypto in zip(operations, cryptos):
+            amounts[operation["mode"]][crypto.id] = operation["amount"]
+
+        # Transactions are bound to a thread, so the operations are applied in one
+        new_amounts, deleted = await sync_to_async(self._apply_operations)(
+            request.user.id, amounts
+        )
+
+        await abump_asset_version(request.user.id)
+
+        assets = [
+            {"crypto": crypto.name, "new_amount": new_amounts[crypto.id]}
+            for crypto in cryptos
+            if crypto.id in new_amounts
+        ]
+
+        return JsonResponse(
+            {
+                "message": f"Successfully applied {len(operations)} operations",
+                "assets": assets,
+                "deleted": deleted,
+            }
+        )
+
+    @transaction.atomic
+    def _apply_operations(self, user_id, amounts):
+        new_amounts = {}
+
+        if amounts[AssetBulkOperationForm.MODE_ADD]:
+            new_amounts.update(
+                Asset.objects.upsert_amounts(
+                    user_id, amounts[AssetBulkOperationForm.MODE_ADD], increment=True
+                )
+            )
+
+        if amounts[AssetBulkOperationForm.MODE_SET]:
+            new_amounts.update(
+                Asset.objects.upsert_amounts(
+                    user_id, amounts[AssetBulkOperationForm.MODE_SET]
+                )
+            )
+
+        deleted = 0
+        if amounts[AssetBulkOperationForm.MODE_DELETE]:
+            deleted, _ = Asset.objects.filter(
+                user_id=user_id,
+                crypto_id__in=amounts[AssetBulkOperationForm.MODE_DELETE],
+            ).delete()
+
+        return new_amounts, deleted
+
+    def _validate_and_return_operations(self, body):
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError:
+            return None, InvalidJsonErrorResponse()
+
+        if not isinstance(data, list) or not data:
+            return None, JsonResponse(
+                {"error": "Request body must be a non-empty list of operations"},
+                status=400,
+            )
+
+        if len(data) > MAX_BULK_OPERATIONS:
+            return None, JsonResponse(
+                {"error": f"At most {MAX_BULK_OPERATIONS} operations are allowed"},
+                status=400,
+            )
+
+        operations = []
+        errors = {}
+
+        for index, operation in enumerate(data):
+            form = AssetBulkOperationForm(
+                operation if isinstance(operation, dict) else {}
+            )
+            if form.is_valid():
+                operations.append(form.cleaned_data)
+            else:
+                errors[index] = form.errors
+
+        if errors:
+            return None, JsonResponse({"error": errors}, status=400)
+
+        duplicates = [
+            name
+            for name, count in Counter(op["crypto"] for op in operations).items()
+            if count > 1
+        ]
+        if duplicates:
+            return None, JsonResponse(
+                {"error": f"Cryptos {', '.join(duplicates)} appear more than once"},
+                status=400,
+            )
+
+        return operations, None
+
+
+class PortfolioView(CustomLoginRequiredMixin, UserAccessOwnResourcesMixin, View):
+    query_budget = 3
+
+    def get(self, request, *args, **kwargs):
+        snapshot_mode = settings.PRICE_SOURCE == "snapshot"
+
+        fields = ["amount", "crypto__name", "crypto__abbreviation"]
+        if snapshot_mode:
+            fields += [
+                "crypto__price_snapshot__price",
+                "crypto__price_snapshot__fetched_at",
+            ]
+
+        rows = list(
+            Asset.objects.filter(user_id=request.user.id).order_by("id").values(*fields)
+        )
+
+        if snapshot_mode:
+            missing = [
+                row["crypto__name"]
+                for row in rows
+                if row["crypto__price_snapshot__price"] is None
+            ]
+            if missing:
+                return NoPriceSnapshotErrorResponse(missing)
+
+            prices = [
+                Price(
+                    str(row["crypto__price_snapshot__price"]),
+                    row["crypto__price_snapshot__fetched_at"].timestamp(),
+                    stale=False,
+                )
+                for row in rows
+            ]
+        else:
+            symbols = [price_symbol(row["crypto__abbreviation"]) for row in rows]
+
+            try:
+                prices_by_symbol = get_prices(symbols)
+            except PriceFetchError as err:
+                return PriceErrorResponse(err, "the prices of the assets")
+
+            prices = [prices_by_symbol[symbol] for symbol in symbols]
+
+        values = [
+            Decimal(str(row["amount"])) * Decimal(price.value)
+            for row, price in zip(rows, prices)
+        ]
+        total = sum(values, Decimal(0))
+
+        assets = [
+            {
+                "crypto_name": row["crypto__name"],
+                "abbreviation": row["crypto__abbreviation"],
+                "amount": row["amount"],
+                "price": price.value,
+                "value": str(value.quantize(CENT)),
+                "allocation": round(float(value / total * 100), 2) if total else 0,
+            }
+            for row, price, value in zip(rows, prices, values)
+        ]
+
+        return JsonResponse(
+            {
+                "user_id": request.user.id,
+                "assets": assets,
+                "total_value": str(total.quantize(CENT)),
+                "unit": PRICE_UNIT,
+                "stale": any(price.stale for price in prices),
+            }
+        )
+
 
 class AssetManagementView(CustomLoginRequiredMixin, UserAccessOwnResourcesMixin, View):
-    def post(self, request, *args, **kwargs):
-        return self._create_or_update(request, *args, **kwargs)
+    query_budget = 4
+
+    async def post(self, request, *args, **kwargs):
+        return await self._create_or_update(request, *args, **kwargs)
 
-    def put(self, request, *args, **kwargs):
-        return self._create_or_update(request, *args, **kwargs)
+    async def put(self, request, *args, **kwargs):
+        return await self._create_or_update(request, *args, **kwargs)
 
-    def delete(self, request, *args, **kwargs):
-        crypto, err = self._validate_and_return_crypto(**kwargs)
+    async def delete(self, request, *args, **kwargs):
+        crypto, err = await self._validate_and_return_crypto(**kwargs)
         if err is not None:
             return err
 
-        try:
-            asset = Asset.objects.get(user=request.user, crypto=crypto)
-            asset.delete()
-        except Asset.DoesNotExist:
+        deleted, _ = await Asset.objects.filter(
+            user_id=request.user.id, crypto=crypto
+        ).adelete()
+        if not deleted:
             return JsonResponse(
                 {
                     "error": f"Cannot delete asset '{crypto.name}' because it does not exist"
@@ -52,35 +278,34 @@ class AssetManagementView(CustomLoginRequiredMixin, UserAccessOwnResourcesMixin,
                 status=404,
             )
 
+        await abump_asset_version(request.user.id)
+
         return JsonResponse({"message": f"Successfully deleted asset {crypto.name}"})
 
-    def _create_or_update(self, request, *args, **kwargs):
+    async def _create_or_update(self, request, *args, **kwargs):
         form, err = self._validate_and_return_request_data(request.body)
         if err is not None:
             return err
 
-        crypto, err = self._validate_and_return_crypto(**kwargs)
+        crypto, err = await self._validate_and_return_crypto(**kwargs)
         if err is not None:
             return err
 
         amount = form.cleaned_data["amount"]
 
-        asset, _ = Asset.objects.get_or_create(
-            user=request.user, crypto=crypto, defaults={"amount": 0}
+        new_amount = await Asset.objects.aupsert_amount(
+            request.user.id,
+            crypto.id,
+            amount,
+            increment=request.method == "POST",
         )
-
-        if request.method == "POST":
-            asset.amount += amount
-        elif request.method == "PUT":
-            asset.amount = amount
-
-        asset.save()
+        await abump_asset_version(request.user.id)
 
         return JsonResponse(
             {
                 "message": f"Successfully added {amount} {crypto.name} to assets",
                 "crypto": crypto.name,
-                "new_amount": asset.amount,
+                "new_amount": new_amount,
             }
         )
 
@@ -96,14 +321,51 @@ class AssetManagementView(CustomLoginRequiredMixin, UserAccessOwnResourcesMixin,
 
         return form, None
 
-    def _validate_and_return_crypto(self, **kwargs):
+    async def _validate_and_return_crypto(self, **kwargs):
         crypto_name = kwargs.get("crypto")
 
-        try:
-            crypto = Crypto.objects.get(name=crypto_name)
-        except Crypto.DoesNotExist:
+        crypto = await crypto_registry.aget(crypto_name)
+        if crypto is None:
             return None, JsonResponse(
                 {"error": f"Crypto {crypto_name} not found"}, status=404
             )
 
         return crypto, None
+
+
+class HoldingsExportView(CustomLoginRequiredMixin, StaffRequiredMixin, View):
+    query_budget = 3
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse(
+                {"error": f"Format must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=400,
+            )
+
+        crypto_id = None
+        crypto_name = request.GET.get("crypto")
+        if crypto_name is not None:
+            crypto = crypto_registry.get(crypto_name)
+            if crypto is None:
+                return JsonResponse(
+                    {"error": f"Crypto {crypto_name} not found"}, status=404
+                )
+
+            crypto_id = crypto.id
+
+        try:
+            updated_since = parse_aware_datetime(request.GET.get("updated_since"))
+        except ValueError:
+            return JsonResponse(
+                {"error": "updated_since must be an ISO 8601 datetime"}, status=400
+            )
+
+        lines = export_holdings(export_format, crypto_id, updated_since)
+        if isinstance(request, ASGIRequest):
+            lines = aiterate_export(lines)
+
+        return StreamingHttpResponse(
+            lines, content_type=EXPORT_CONTENT_TYPES[export_format]
+        )
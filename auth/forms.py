@@ -1,7 +1,23 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Func
 from django import forms
 
+# Unique index on NULLIF(LOWER(email), '') created by migration 0001 of this app
+EMAIL_UNIQUE_INDEX = "auth_user_email_lower_uniq"
+
+
+class EmailKey(Func):
+    """
+    The expression of the unique email index. The empty string is part of the
+    template rather than a query parameter, otherwise SQLite does not match the
+    expression against the index.
+    """
+
+    template = "NULLIF(LOWER(%(expressions)s), '')"
+    output_field = CharField()
+
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True)
@@ -13,7 +29,37 @@ class CustomUserCreationForm(UserCreationForm):
         email = self.cleaned_data.get("email")
         User = get_user_model()
 
-        if User.objects.filter(email=email).exists():
+        # Same expression as the unique index, so the lookup is answered from it
+        exists = (
+            User.objects.annotate(email_key=EmailKey("email"))
+            .filter(email_key=email.lower())
+            .exists()
+        )
+        if exists:
             raise forms.ValidationError("Email address already exists.")
 
         return email
+
+    def save(self, commit=True):
+        """
+        Creates the user and returns it. A registration racing another one with the
+        same email or username passes validation but fails at insert time on the
+        unique indexes. In that case, the error is added to the form and None is
+        returned.
+        """
+        try:
+            with transaction.atomic():
+                return super().save(commit=commit)
+        except IntegrityError as err:
+            if EMAIL_UNIQUE_INDEX in str(err):
+                self.add_error("email", "Email address already exists.")
+            elif "username" in str(err):
+                User = get_user_model()
+                self.add_error(
+                    "username",
+                    User._meta.get_field("username").error_messages["unique"],
+                )
+            else:
+                raise
+
+        return None
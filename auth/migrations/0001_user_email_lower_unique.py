@@ -0,0 +1,78 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+INDEX_NAME = "auth_user_email_lower_uniq"
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Fails with a list of the users whose emails differ only in case, which earlier
+    versions accepted. Users own assets and sessions, so they are not merged here;
+    they have to be resolved by hand before the index can be created.
+    """
+    User = apps.get_model("auth", "User")
+    duplicates = (
+        User.objects.exclude(email="")
+        .annotate(email_key=Lower("email"))
+        .values("email_key")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("email_key", flat=True)
+    )
+
+    conflicts = []
+    for email_key in duplicates:
+        users = (
+            User.objects.annotate(email_key=Lower("email"))
+            .filter(email_key=email_key)
+            .order_by("id")
+        )
+        conflicts.append(", ".join(f"{user.email} (id {user.id})" for user in users))
+
+    if conflicts:
+        raise RuntimeError(
+            "Users with emails differing only in case must be merged or given other "
+            "emails before the unique email index can be created: "
+            + "; ".join(conflicts)
+        )
+
+
+def create_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # A failed concurrent build leaves an invalid index behind, which would
+        # otherwise block retrying the migration
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY {INDEX_NAME} "
+            "ON auth_user (NULLIF(LOWER(email), ''))"
+        )
+    else:
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (NULLIF(LOWER(email), ''))"
+        )
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+    else:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run in a transaction. It builds the index
+    # without blocking writes to auth_user.
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        # auth_user belongs to django.contrib.auth, so the index cannot be declared in
+        # model state. Blank emails map to NULL, which may occur any number of times.
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
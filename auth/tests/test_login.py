@@ -1,12 +1,14 @@
 import json
 from django.test import Client, TestCase
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.urls import reverse
 
 
 class LoginTestCase(TestCase):
     def setUp(self):
         self.client = Client()
+        cache.clear()
         self.username = "test_user"
         self.password = "test_pw1234"
         self.email = "test@test.com"
@@ -1,12 +1,17 @@
 import json
+from unittest.mock import patch
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from auth.forms import CustomUserCreationForm, EmailKey
+
 
 class RegistrationTestCase(TestCase):
     def setUp(self):
         self.client = Client()
+        cache.clear()
         self.username = "test_user"
         self.password = "test_pw1234"
         self.email = "test@test.com"
@@ -123,3 +128,41 @@ class RegistrationTestCase(TestCase):
         )
 
         self.assertEqual(response.status_code, 400)
+
+    def test_register_duplicate_email_with_different_case(self):
+        self._register(self.username, self.password, self.password, self.email)
+
+        response = self._register(
+            "new_user", self.password, self.password, self.email.upper()
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"], {"email": ["Email address already exists."]}
+        )
+
+    def test_register_duplicate_email_in_concurrent_registration(self):
+        self._register(self.username, self.password, self.password, self.email)
+
+        # A concurrent registration passes validation before the other one is inserted
+        with patch.object(
+            CustomUserCreationForm,
+            "clean_email",
+            lambda form: form.cleaned_data["email"],
+        ):
+            response = self._register(
+                "new_user", self.password, self.password, "Test@Test.com"
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"], {"email": ["Email address already exists."]}
+        )
+        self.assertFalse(User.objects.filter(username="new_user").exists())
+
+    def test_email_lookup_uses_unique_index(self):
+        queryset = User.objects.annotate(email_key=EmailKey("email")).filter(
+            email_key=self.email
+        )
+
+        self.assertIn("auth_user_email_lower_uniq", queryset.explain())
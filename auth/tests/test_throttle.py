@@ -0,0 +1,149 @@
+import json
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+AUTH_THROTTLE = {
+    "ip": {"capacity": 5, "refill_seconds": 10},
+    "username": {"capacity": 2, "refill_seconds": 60},
+}
+
+
+@override_settings(AUTH_THROTTLE=AUTH_THROTTLE)
+class AuthThrottleTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+        self.password = "test_pw1234"
+        self.user = User.objects.create_user(
+            username="test_user", password=self.password, email="test@test.com"
+        )
+
+    def _login(self, username, password, ip="10.0.0.1"):
+        return self.client.post(
+            reverse("login"),
+            data=json.dumps({"username": username, "password": password}),
+            content_type="application/json",
+            REMOTE_ADDR=ip,
+        )
+
+    def _register(self, username, ip="10.0.0.1"):
+        return self.client.post(
+            reverse("register"),
+            data=json.dumps(
+                {
+                    "username": username,
+                    "email": f"{username}@test.com",
+                    "password1": self.password,
+                    "password2": self.password,
+                }
+            ),
+            content_type="application/json",
+            REMOTE_ADDR=ip,
+        )
+
+    @patch("auth.throttle.time.time", return_value=1000)
+    def test_login_is_throttled_per_username(self, mock_time):
+        for _ in range(2):
+            self.assertEqual(self._login("test_user", "wrong").status_code, 400)
+
+        # Usernames are compared case-insensitively
+        response = self._login("Test_User", self.password, ip="10.0.0.2")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(
+            response.json(), {"error": "Too many attempts, please try again later"}
+        )
+
+    @patch("auth.throttle.time.time", return_value=1000)
+    def test_login_is_throttled_per_ip(self, mock_time):
+        for i in range(5):
+            self._login(f"user{i}", "wrong")
+
+        response = self._login("test_user", self.password)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "10")
+
+        # Other clients are not affected
+        response = self._login("test_user", self.password, ip="10.0.0.2")
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(AUTH_THROTTLE_IP_HEADER="X-Forwarded-For")
+    @patch("auth.throttle.time.time", return_value=1000)
+    def test_login_is_throttled_per_forwarded_ip(self, mock_time):
+        def login(username, forwarded_for):
+            return self.client.post(
+                reverse("login"),
+                data=json.dumps({"username": username, "password": "wrong"}),
+                content_type="application/json",
+                REMOTE_ADDR="10.0.0.100",
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        # Addresses prepended by the client are ignored
+        for i in range(5):
+            login(f"user{i}", f"192.0.2.{i}, 203.0.113.1")
+
+        self.assertEqual(login("test_user", "203.0.113.1").status_code, 429)
+
+        # Clients behind the same proxy have separate buckets
+        self.assertEqual(login("test_user", "203.0.113.2").status_code, 400)
+
+    def test_throttled_login_does_not_check_password(self):
+        for i in range(5):
+            self._login(f"user{i}", "wrong")
+
+        with patch("auth.views.AuthenticationForm") as mock_form:
+            response = self._login("test_user", self.password)
+
+        self.assertEqual(response.status_code, 429)
+        mock_form.assert_not_called()
+
+    def test_bucket_is_refilled_over_time(self):
+        with patch("auth.throttle.time.time", return_value=1000):
+            for _ in range(2):
+                self._login("test_user", "wrong")
+
+            self.assertEqual(self._login("test_user", self.password).status_code, 429)
+
+        with patch("auth.throttle.time.time", return_value=1060):
+            self.assertEqual(self._login("test_user", self.password).status_code, 200)
+
+    def test_register_is_throttled(self):
+        for i in range(5):
+            self.assertEqual(self._register(f"new_user{i}").status_code, 201)
+
+        response = self._register("new_user5")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(username="new_user5").exists())
+
+    def test_staff_can_get_throttle_stats(self):
+        for _ in range(3):
+            self._login("test_user", "wrong")
+        self._login("test_user", "wrong", ip="10.0.0.2")
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("auth-throttle-stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"admitted": 2, "rejected_by_ip": 0, "rejected_by_username": 2},
+        )
+
+    def test_non_staff_user_cannot_get_throttle_stats(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("auth-throttle-stats"))
+
+        self.assertEqual(response.status_code, 403)
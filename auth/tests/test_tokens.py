@@ -0,0 +1,150 @@
+import json
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
+
+
+class TokenAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+        self.username = "test_user"
+        self.password = "test_pw1234"
+        self.user = User.objects.create_user(
+            username=self.username, password=self.password, email="test@test.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="other_user", password=self.password, email="other@test.com"
+        )
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+    def _post(self, url_name, data):
+        return self.client.post(
+            reverse(url_name), data=json.dumps(data), content_type="application/json"
+        )
+
+    def _login_with_token(self):
+        return self._post(
+            "login",
+            {"username": self.username, "password": self.password, "token": True},
+        )
+
+    def _list_assets(self, user_id, access_token):
+        return self.client.get(
+            reverse("list-assets", kwargs={"user_id": user_id}),
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+        )
+
+    def test_login_with_token(self):
+        response = self._login_with_token()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("sessionid", response.cookies)
+
+        json_data = response.json()
+        self.assertEqual(json_data["user_id"], self.user.id)
+        self.assertEqual(json_data["token_type"], "Bearer")
+        self.assertEqual(json_data["expires_in"], 300)
+        self.assertIn("access_token", json_data)
+        self.assertIn("refresh_token", json_data)
+
+    def test_access_token_authenticates_without_database_lookup(self):
+        access_token = self._login_with_token().json()["access_token"]
+        crypto_registry.all()
+
+        # Only the query of the asset list itself
+        with self.assertNumQueries(1):
+            response = self._list_assets(self.user.id, access_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"assets": []})
+
+    def test_access_token_cannot_access_resources_of_other_users(self):
+        access_token = self._login_with_token().json()["access_token"]
+
+        with self.assertNumQueries(0):
+            response = self._list_assets(self.other_user.id, access_token)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_tampered_access_token(self):
+        access_token = self._login_with_token().json()["access_token"]
+
+        response = self._list_assets(self.user.id, access_token[:-1] + "x")
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid or expired access token"})
+
+    def test_expired_access_token(self):
+        access_token = self._login_with_token().json()["access_token"]
+
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            response = self._list_assets(self.user.id, access_token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_token_is_no_access_token(self):
+        refresh_token = self._login_with_token().json()["refresh_token"]
+
+        response = self._list_assets(self.user.id, refresh_token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_access_token_carries_staff_privileges(self):
+        self.user.is_staff = True
+        self.user.save()
+        access_token = self._login_with_token().json()["access_token"]
+
+        response = self.client.get(
+            reverse("price-cache-stats"), HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_refresh_access_token(self):
+        refresh_token = self._login_with_token().json()["refresh_token"]
+
+        response = self._post("refresh-token", {"refresh_token": refresh_token})
+
+        self.assertEqual(response.status_code, 200)
+
+        json_data = response.json()
+        self.assertEqual(json_data["user_id"], self.user.id)
+        self.assertEqual(
+            self._list_assets(self.user.id, json_data["access_token"]).status_code, 200
+        )
+
+    def test_refresh_with_invalid_token(self):
+        access_token = self._login_with_token().json()["access_token"]
+
+        response = self._post("refresh-token", {"refresh_token": access_token})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid or expired refresh token"})
+
+    def test_refresh_for_deactivated_user(self):
+        refresh_token = self._login_with_token().json()["refresh_token"]
+        self.user.is_active = False
+        self.user.save()
+
+        response = self._post("refresh-token", {"refresh_token": refresh_token})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_after_password_change(self):
+        refresh_token = self._login_with_token().json()["refresh_token"]
+        self.user.set_password("new_pw5678")
+        self.user.save()
+
+        response = self._post("refresh-token", {"refresh_token": refresh_token})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid or expired refresh token"})
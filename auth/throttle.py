@@ -0,0 +1,146 @@
+import hashlib
+import json
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+from crypto_assets_server.counters import CacheCounters
+
+THROTTLE_CACHE_KEY_PREFIX = "auth:throttle"
+
+_stats = CacheCounters(
+    THROTTLE_CACHE_KEY_PREFIX, ("admitted", "rejected_by_ip", "rejected_by_username")
+)
+
+# How long an attempt waits for a concurrent attempt to update the same bucket
+BUCKET_LOCK_WAIT = 0.1
+BUCKET_LOCK_POLL_INTERVAL = 0.005
+
+
+class TooManyAttemptsResponse(JsonResponse):
+    def __init__(self, retry_after):
+        super().__init__(
+            {"error": "Too many attempts, please try again later"}, status=429
+        )
+        self["Retry-After"] = math.ceil(retry_after)
+
+
+def throttle_auth_attempts(view):
+    """
+    Rejects requests to the decorated view with 429 once the token bucket of the client
+    IP or of the username in the request body is empty, before the view hashes any
+    password. Buckets are kept in the default cache, so all workers sharing the cache
+    share them. Each bucket holds AUTH_THROTTLE[scope]["capacity"] attempts and gains
+    one attempt every AUTH_THROTTLE[scope]["refill_seconds"] seconds.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        identifiers = {"ip": _client_ip(request)}
+
+        username = _username(request)
+        if username:
+            identifiers["username"] = username
+
+        for scope, identifier in identifiers.items():
+            retry_after = _consume(scope, identifier)
+            if retry_after > 0:
+                _stats.increment(f"rejected_by_{scope}")
+                return TooManyAttemptsResponse(retry_after)
+
+        _stats.increment("admitted")
+
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+def get_auth_throttle_stats():
+    return _stats.values()
+
+
+def _consume(scope, identifier):
+    """
+    Takes one attempt from the bucket and returns 0, or returns the seconds until the
+    bucket holds an attempt again if it is empty.
+    """
+    capacity = settings.AUTH_THROTTLE[scope]["capacity"]
+    refill_seconds = settings.AUTH_THROTTLE[scope]["refill_seconds"]
+
+    digest = hashlib.sha256(identifier.encode()).hexdigest()
+    key = f"{THROTTLE_CACHE_KEY_PREFIX}:{scope}:{digest}"
+
+    if not _acquire_bucket_lock(key):
+        # The bucket is contended by concurrent attempts, which is a flood already
+        return refill_seconds
+
+    try:
+        now = time.time()
+        bucket = cache.get(key)
+
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens, updated_at = bucket
+            tokens = min(capacity, tokens + (now - updated_at) / refill_seconds)
+
+        retry_after = 0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) * refill_seconds
+
+        # Once expired, the bucket would have been refilled completely anyway
+        cache.set(key, (tokens, now), timeout=math.ceil(capacity * refill_seconds))
+    finally:
+        cache.delete(f"{key}:lock")
+
+    return retry_after
+
+
+def _acquire_bucket_lock(key):
+    deadline = time.monotonic() + BUCKET_LOCK_WAIT
+
+    while not cache.add(f"{key}:lock", 1, timeout=1):
+        if time.monotonic() > deadline:
+            return False
+
+        time.sleep(BUCKET_LOCK_POLL_INTERVAL)
+
+    return True
+
+
+def _client_ip(request):
+    """
+    Returns the IP the outermost of the AUTH_THROTTLE_PROXY_COUNT trusted reverse
+    proxies received the request from, as appended by them to the comma separated
+    AUTH_THROTTLE_IP_HEADER. Clients can only prepend addresses to the header, which
+    are ignored. Without the setting, or the header, it is the IP of the peer.
+    """
+    header = settings.AUTH_THROTTLE_IP_HEADER
+    if header:
+        addresses = [
+            address.strip()
+            for address in request.headers.get(header, "").split(",")
+            if address.strip()
+        ]
+        if addresses and len(addresses) >= settings.AUTH_THROTTLE_PROXY_COUNT:
+            return addresses[-settings.AUTH_THROTTLE_PROXY_COUNT]
+
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _username(request):
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get("username"), str):
+        return None
+
+    return data["username"].strip().lower()
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+
+ACCESS_TOKEN_SALT = "auth.tokens.access"
+REFRESH_TOKEN_SALT = "auth.tokens.refresh"
+
+# Characters of the session auth hash of the user carried by refresh tokens
+AUTH_HASH_LENGTH = 16
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class TokenUser:
+    """
+    Stands in for request.user on requests authenticated with an access token. It only
+    carries the claims of the token, so no database lookup is needed.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, user_id, is_staff=False):
+        self.id = self.pk = user_id
+        self.is_staff = is_staff
+
+
+def issue_tokens(user):
+    """
+    Returns a short-lived access token and a long-lived refresh token for the given
+    user. Both are signed with an HMAC of SECRET_KEY. Access tokens are verified
+    without a database lookup; refresh tokens are bound to the password of the user,
+    see refresh_token_is_current().
+    """
+    access_token = signing.dumps(
+        {"uid": user.id, "staff": user.is_staff}, salt=ACCESS_TOKEN_SALT
+    )
+    refresh_token = signing.dumps(
+        {"uid": user.id, "auth": _auth_hash(user)}, salt=REFRESH_TOKEN_SALT
+    )
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "Bearer",
+        "expires_in": settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def bearer_token(request):
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    return token.strip()
+
+
+def verify_access_token(token):
+    claims = _load(token, ACCESS_TOKEN_SALT, settings.ACCESS_TOKEN_LIFETIME)
+
+    return TokenUser(claims["uid"], is_staff=claims.get("staff", False))
+
+
+def verify_refresh_token(token):
+    """
+    Returns the id of the user the refresh token was issued to and the fragment of
+    their session auth hash it is bound to.
+    """
+    claims = _load(token, REFRESH_TOKEN_SALT, settings.REFRESH_TOKEN_LIFETIME)
+
+    return claims["uid"], claims.get("auth", "")
+
+
+def refresh_token_is_current(user, auth_hash):
+    """
+    Returns whether a refresh token bound to the given auth hash is still valid for
+    the user. The session auth hash derives from the password hash, so changing the
+    password revokes all refresh tokens of the user, as it ends their sessions.
+    """
+    return constant_time_compare(_auth_hash(user), auth_hash)
+
+
+def _auth_hash(user):
+    return user.get_session_auth_hash()[:AUTH_HASH_LENGTH]
+
+
+def _load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.BadSignature as err:
+        # SignatureExpired is a subclass of BadSignature
+        raise InvalidTokenError(str(err)) from err
@@ -6,4 +6,10 @@ urlpatterns = [
     path("register", views.register_user, name="register"),
     path("login", views.login_user, name="login"),
     path("logout", views.logout_user, name="logout"),
+    path("token/refresh", views.refresh_token, name="refresh-token"),
+    path(
+        "auth-throttle/stats",
+        views.AuthThrottleStatsView.as_view(),
+        name="auth-throttle-stats",
+    ),
 ]
@@ -1,14 +1,26 @@
 import json
-from django.contrib.auth import login, logout
+from django.contrib.auth import get_user_model, login, logout
 from django.contrib.auth.forms import AuthenticationForm
 from django.http import JsonResponse
+from django.views import View
 from django.views.decorators.http import require_http_methods
 
 from crypto_assets_server.errors import InvalidJsonErrorResponse
+from crypto_assets_server.mixins import CustomLoginRequiredMixin, StaffRequiredMixin
+from crypto_assets_server.query_budget import query_budget
 from .forms import CustomUserCreationForm
+from .throttle import get_auth_throttle_stats, throttle_auth_attempts
+from .tokens import (
+    InvalidTokenError,
+    issue_tokens,
+    refresh_token_is_current,
+    verify_refresh_token,
+)
 
 
+@query_budget(6)
 @require_http_methods(["POST"])
+@throttle_auth_attempts
 def register_user(request):
     try:
         data = json.loads(request.body)
@@ -20,12 +32,15 @@ def register_user(request):
     if not form.is_valid():
         return JsonResponse({"error": form.errors}, status=400)
 
-    form.save()
+    if form.save() is None:
+        return JsonResponse({"error": form.errors}, status=400)
 
     return JsonResponse({"message": "Successfully created user"}, status=201)
 
 
+@query_budget(6)
 @require_http_methods(["POST"])
+@throttle_auth_attempts
 def login_user(request):
     try:
         data = json.loads(request.body)
@@ -38,13 +53,49 @@ def login_user(request):
         return JsonResponse({"error": "Invalid username or password"}, status=400)
 
     user = form.get_user()
+
+    if data.get("token"):
+        return JsonResponse(
+            {"message": "Successfully logged in", "user_id": user.id}
+            | issue_tokens(user)
+        )
+
     login(request, user)
 
     return JsonResponse({"message": "Successfully logged in", "user_id": user.id})
 
 
+@query_budget(1)
+@require_http_methods(["POST"])
+def refresh_token(request):
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return InvalidJsonErrorResponse()
+
+    try:
+        user_id, auth_hash = verify_refresh_token(str(data.get("refresh_token", "")))
+    except InvalidTokenError:
+        return JsonResponse({"error": "Invalid or expired refresh token"}, status=401)
+
+    # Refreshing is the point where deactivated users lose access
+    user = get_user_model().objects.filter(id=user_id, is_active=True).first()
+    if user is None or not refresh_token_is_current(user, auth_hash):
+        return JsonResponse({"error": "Invalid or expired refresh token"}, status=401)
+
+    return JsonResponse({"user_id": user.id} | issue_tokens(user))
+
+
+@query_budget(4)
 @require_http_methods(["POST"])
 def logout_user(request):
     logout(request)
 
     return JsonResponse({"message": "Successfully logged out"})
+
+
+class AuthThrottleStatsView(CustomLoginRequiredMixin, StaffRequiredMixin, View):
+    query_budget = 2
+
+    def get(self, *args, **kwargs):
+        return JsonResponse(get_auth_throttle_stats())
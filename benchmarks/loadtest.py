@@ -0,0 +1,265 @@
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+
+# Relative frequency of the requests of a logged in user
+TRAFFIC_MIX = {
+    "cryptos": 15,
+    "crypto-price": 30,
+    "list-assets": 25,
+    "create-asset": 12,
+    "replace-asset": 10,
+    "delete-asset": 8,
+}
+PASSWORD = "Tr4ffic-Mix-5831"
+
+
+class Recorder:
+    """
+    Collects the latency and outcome of every request of a load test by endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+
+    def record(self, endpoint, latency, ok):
+        with self._lock:
+            self._latencies[endpoint].append(latency)
+            if not ok:
+                self._errors[endpoint] += 1
+
+    def report(self, elapsed):
+        with self._lock:
+            endpoints = {
+                endpoint: _summarize(latencies, self._errors[endpoint], elapsed)
+                for endpoint, latencies in sorted(self._latencies.items())
+            }
+            total = _summarize(
+                [
+                    latency
+                    for latencies in self._latencies.values()
+                    for latency in latencies
+                ],
+                sum(self._errors.values()),
+                elapsed,
+            )
+
+        return {"endpoints": endpoints, "total": total}
+
+
+class VirtualUser:
+    """
+    Registers and logs in a new user, then sends requests in the proportions of
+    TRAFFIC_MIX until stopped. Assets are only replaced and deleted while the user
+    holds some.
+    """
+
+    def __init__(self, base_url, username, recorder, rng, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.recorder = recorder
+        self.rng = rng
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.user_id = None
+        self.cryptos = []
+        self.holdings = set()
+
+    def login(self):
+        response = self._request(
+            "register",
+            "POST",
+            "/register",
+            json={
+                "username": self.username,
+                "email": f"{self.username}@example.com",
+                "password1": PASSWORD,
+                "password2": PASSWORD,
+            },
+        )
+        if response is None or response.status_code != 201:
+            return False
+
+        response = self._request(
+            "login",
+            "POST",
+            "/login",
+            json={"username": self.username, "password": PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            return False
+
+        self.user_id = response.json()["user_id"]
+
+        response = self._request("cryptos", "GET", "/cryptos")
+        if response is None or response.status_code != 200:
+            return False
+
+        self.cryptos = [crypto["name"] for crypto in response.json()["cryptos"]]
+
+        return bool(self.cryptos)
+
+    def step(self):
+        endpoint = self.rng.choices(
+            list(TRAFFIC_MIX), weights=list(TRAFFIC_MIX.values())
+        )[0]
+
+        if endpoint in ("replace-asset", "delete-asset") and not self.holdings:
+            endpoint = "create-asset"
+
+        if endpoint == "cryptos":
+            self._request(endpoint, "GET", "/cryptos")
+        elif endpoint == "crypto-price":
+            crypto = self.rng.choice(self.cryptos)
+            self._request(endpoint, "GET", f"/cryptos/{crypto}/price")
+        elif endpoint == "list-assets":
+            self._request(endpoint, "GET", f"/users/{self.user_id}/assets")
+        elif endpoint == "create-asset":
+            crypto = self.rng.choice(self.cryptos)
+            if self._change_asset(endpoint, "POST", crypto):
+                self.holdings.add(crypto)
+        elif endpoint == "replace-asset":
+            self._change_asset(endpoint, "PUT", self.rng.choice(sorted(self.holdings)))
+        else:
+            crypto = self.rng.choice(sorted(self.holdings))
+            if self._change_asset(endpoint, "DELETE", crypto):
+                self.holdings.discard(crypto)
+
+    def _change_asset(self, endpoint, method, crypto):
+        kwargs = {}
+        if method != "DELETE":
+            kwargs["json"] = {"amount": round(self.rng.uniform(0.01, 10), 4)}
+
+        response = self._request(
+            endpoint, method, f"/users/{self.user_id}/assets/{crypto}", **kwargs
+        )
+
+        return response is not None and response.status_code == 200
+
+    def _request(self, endpoint, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.base_url + path, timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            response = None
+
+        self.recorder.record(
+            endpoint,
+            time.perf_counter() - started,
+            ok=response is not None and response.status_code < 400,
+        )
+
+        return response
+
+
+def run_load_test(base_url, concurrency, duration, seed=None, timeout=10):
+    """
+    Drives `concurrency` virtual users against the server at `base_url` for `duration`
+    seconds, including their registration and login, and returns the report of
+    Recorder.report().
+    """
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    rng = random.Random(seed)
+    seeds = [rng.random() for _ in range(concurrency)]
+    logged_in = []
+    started = time.monotonic()
+    deadline = started + duration
+
+    def run(index):
+        user = VirtualUser(
+            base_url,
+            f"loadtest-{run_id}-{index}",
+            recorder,
+            random.Random(seeds[index]),
+            timeout=timeout,
+        )
+        if not user.login():
+            return
+
+        logged_in.append(index)
+
+        while time.monotonic() < deadline:
+            user.step()
+
+    threads = [
+        threading.Thread(target=run, args=(index,), daemon=True)
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    report = recorder.report(time.monotonic() - started)
+    report["concurrency"] = concurrency
+    report["logged_in_users"] = len(logged_in)
+    report["duration"] = duration
+
+    return report
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """
+    Returns a description of every endpoint of the baseline whose p95 or p99 latency
+    grew, or whose requests/s dropped, by more than `tolerance` (e.g. 0.2 for 20%).
+    """
+    regressions = []
+
+    for endpoint, expected in baseline["endpoints"].items():
+        actual = report["endpoints"].get(endpoint)
+        if actual is None:
+            regressions.append(f"{endpoint}: no requests")
+            continue
+
+        for name in ("p95", "p99"):
+            limit = expected["latency_ms"][name] * (1 + tolerance)
+            if actual["latency_ms"][name] > limit:
+                regressions.append(
+                    f"{endpoint}: {name} latency "
+                    f"{actual['latency_ms'][name]} ms > {limit:.1f} ms"
+                )
+
+        limit = expected["requests_per_second"] * (1 - tolerance)
+        if actual["requests_per_second"] < limit:
+            regressions.append(
+                f"{endpoint}: {actual['requests_per_second']} requests/s "
+                f"< {limit:.1f} requests/s"
+            )
+
+    return regressions
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of the given sorted values.
+    """
+    if not values:
+        return 0
+
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def _summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "latency_ms": {
+            name: round(percentile(latencies, percent) * 1000, 2)
+            for name, percent in (("p50", 50), ("p95", 95), ("p99", 99))
+        },
+    }
@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from benchmarks.micro import Benchmarks, compare_to_baseline, measure
+
+BASELINE_PATH = Path(__file__).resolve().parents[2] / "baselines" / "micro.json"
+
+# Logins of the benchmark are not throttled
+AUTH_THROTTLE = {
+    "ip": {"capacity": 1_000_000, "refill_seconds": 0.001},
+    "username": {"capacity": 1_000_000, "refill_seconds": 0.001},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the view hot paths in process against an in-memory database, "
+        "reports calls per second and peak memory per call as JSON and fails on "
+        "regressions against the baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names", nargs="*", help="Only run benchmarks whose names contain these"
+        )
+        parser.add_argument(
+            "--baseline",
+            default=str(BASELINE_PATH),
+            help="Baseline file to compare against (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store the results in the baseline file instead of comparing",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Share by which a benchmark may regress (default: 0.25)",
+        )
+        parser.add_argument(
+            "--min-time",
+            type=float,
+            default=0.2,
+            help="Minimum seconds of each timing round",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of timing rounds"
+        )
+
+    def handle(self, *args, **options):
+        old_name = self._create_database()
+        try:
+            with override_settings(AUTH_THROTTLE=AUTH_THROTTLE):
+                results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(json.dumps(results, indent=4))
+
+        baseline_path = Path(options["baseline"])
+
+        if options["save_baseline"]:
+            baseline = {}
+            if baseline_path.exists():
+                baseline = json.loads(baseline_path.read_text())
+
+            baseline_path.write_text(json.dumps(baseline | results, indent=4) + "\n")
+            self.stderr.write(f"Saved baseline to {baseline_path}")
+            return
+
+        if not baseline_path.exists():
+            self.stderr.write(f"No baseline at {baseline_path}")
+            return
+
+        regressions = compare_to_baseline(
+            results, json.loads(baseline_path.read_text()), options["threshold"]
+        )
+        if regressions:
+            raise CommandError(
+                "Regressions against baseline:\n" + "\n".join(regressions)
+            )
+
+        self.stderr.write("No regressions against baseline")
+
+    def _create_database(self):
+        # Without a test database name, SQLite test databases are kept in memory
+        connection.settings_dict["TEST"]["NAME"] = None
+
+        return connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+
+    def _run(self, options):
+        cache.clear()
+
+        benchmarks = Benchmarks()
+        benchmarks.setup()
+
+        results = {}
+        for name, func in benchmarks.all().items():
+            if options["names"] and not any(part in name for part in options["names"]):
+                continue
+
+            self.stderr.write(f"Running {name}")
+            results[name] = measure(
+                func, min_time=options["min_time"], repeat=options["repeat"]
+            )
+
+        return results
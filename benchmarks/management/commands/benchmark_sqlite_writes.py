@@ -0,0 +1,50 @@
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from benchmarks.sqlite import run_write_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares concurrent asset writes and reads on SQLite with the default "
+        "connection settings and with settings.SQLITE_PRAGMAS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers", type=int, default=8, help="Number of writing threads"
+        )
+        parser.add_argument(
+            "--readers", type=int, default=4, help="Number of reading threads"
+        )
+        parser.add_argument(
+            "--duration", type=float, default=5, help="Seconds per configuration"
+        )
+        parser.add_argument(
+            "--directory",
+            default=str(settings.BASE_DIR),
+            help="Directory of the benchmark databases, on the disk of the real "
+            "database (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        configurations = {"default": {}, "tuned": settings.SQLITE_PRAGMAS}
+        results = {}
+
+        with tempfile.TemporaryDirectory(dir=options["directory"]) as directory:
+            for name, pragmas in configurations.items():
+                self.stderr.write(f"Running {name}")
+                results[name] = run_write_benchmark(
+                    f"{directory}/{name}.sqlite3",
+                    pragmas,
+                    writers=options["writers"],
+                    readers=options["readers"],
+                    duration=options["duration"],
+                )
+
+        results["pragmas"] = settings.SQLITE_PRAGMAS
+
+        self.stdout.write(json.dumps(results, indent=4))
@@ -0,0 +1,128 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.loadtest import compare_to_baseline, run_load_test
+from benchmarks.stub import BinanceStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives a mix of register, login, crypto, price and asset requests against a "
+        "running server and reports latency percentiles and requests/s per endpoint "
+        "as JSON. Prices are served by a local Binance stub server, which the server "
+        "under test is pointed at with DJANGO_SETTINGS_MODULE=benchmarks.settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="Base URL of the server under test",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Number of virtual users"
+        )
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Seconds to run the load test"
+        )
+        parser.add_argument(
+            "--seed", type=int, help="Seed of the random traffic, for reproducible runs"
+        )
+        parser.add_argument(
+            "--stub-port",
+            type=int,
+            default=8001,
+            help="Port of the Binance stub server",
+        )
+        parser.add_argument(
+            "--stub-latency",
+            type=float,
+            default=50,
+            help="Milliseconds the stub server waits before responding",
+        )
+        parser.add_argument(
+            "--stub-error-rate",
+            type=float,
+            default=0,
+            help="Share of stub server responses failing with status 500",
+        )
+        parser.add_argument(
+            "--no-stub",
+            action="store_true",
+            help="Do not start the stub server, e.g. if it runs elsewhere",
+        )
+        parser.add_argument("--output", help="Write the report to this file")
+        parser.add_argument(
+            "--baseline",
+            help="Fail if the report regressed against the report in this file",
+        )
+        parser.add_argument(
+            "--save-baseline", help="Store the report as baseline in this file"
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Share by which latencies and requests/s may regress (default: 0.2)",
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"], encoding="utf-8") as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as err:
+                raise CommandError(f"Cannot read baseline: {err}")
+
+        stub = None
+        if not options["no_stub"]:
+            stub = BinanceStubServer(
+                port=options["stub_port"],
+                latency=options["stub_latency"] / 1000,
+                error_rate=options["stub_error_rate"],
+            ).start()
+
+        try:
+            report = run_load_test(
+                options["url"],
+                options["concurrency"],
+                options["duration"],
+                seed=options["seed"],
+            )
+        finally:
+            if stub is not None:
+                stub.stop()
+
+        if stub is not None:
+            report["stub"] = {
+                "latency_ms": options["stub_latency"],
+                "error_rate": options["stub_error_rate"],
+                "requests": stub.requests,
+            }
+
+        if not report["logged_in_users"]:
+            raise CommandError(
+                f"No virtual user could register and log in at {options['url']}"
+            )
+
+        output = json.dumps(report, indent=4)
+        self.stdout.write(output)
+
+        for path in (options["output"], options["save_baseline"]):
+            if path:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(output + "\n")
+
+        if baseline is not None:
+            regressions = compare_to_baseline(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against baseline:\n" + "\n".join(regressions)
+                )
+
+            self.stderr.write("No regressions against baseline")
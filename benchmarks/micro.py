@@ -0,0 +1,192 @@
+import json
+import time
+import tracemalloc
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from assets.models import Asset
+from assets.views import AssetListView, AssetManagementView
+from auth.views import login_user
+from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
+from cryptos.views import CryptoListView
+
+CATALOG_SIZE = 1000
+ASSET_COUNTS = (1, 10, 100)
+PASSWORD = "Micro-Bench-7316"
+
+
+class Benchmarks:
+    """
+    Calls the hot paths of the views in process with RequestFactory, bypassing the
+    middleware. The data is created once by setup(), which expects an empty database.
+    """
+
+    def __init__(self):
+        self.factory = RequestFactory()
+        self.users = {}
+        self.payload = None
+
+    def setup(self):
+        Crypto.objects.bulk_create(
+            Crypto(
+                name=f"crypto-{index}",
+                abbreviation=f"C{index}",
+                iconurl=f"https://test.com/{index}.png",
+            )
+            for index in range(CATALOG_SIZE)
+        )
+        # bulk_create() sends no signals
+        crypto_registry.invalidate()
+        cryptos = crypto_registry.all()
+
+        User = get_user_model()
+        for count in ASSET_COUNTS + ("writer",):
+            self.users[count] = User.objects.create_user(
+                username=f"bench-{count}",
+                email=f"bench-{count}@example.com",
+                password=PASSWORD,
+            )
+
+        for count in ASSET_COUNTS:
+            Asset.objects.bulk_create(
+                Asset(user=self.users[count], crypto=crypto, amount=1.5)
+                for crypto in cryptos[:count]
+            )
+
+        self.payload = json.loads(self.asset_list(100).content)
+
+    def all(self):
+        """
+        Returns a dict mapping the name of each benchmark to a function running it
+        once.
+        """
+        benchmarks = {
+            f"asset-list-get-{count}": lambda count=count: self.asset_list(count)
+            for count in ASSET_COUNTS
+        }
+        benchmarks.update(
+            {
+                "asset-create-post": lambda: self.change_asset("post"),
+                "asset-replace-put": lambda: self.change_asset("put"),
+                "crypto-list-get-1000": self.crypto_list,
+                "login": self.login,
+                "json-response-100-assets": self.json_response,
+            }
+        )
+
+        return benchmarks
+
+    def asset_list(self, count):
+        user = self.users[count]
+        request = self.factory.get(f"/users/{user.id}/assets")
+        request.user = user
+
+        return _check(async_to_sync(AssetListView.as_view())(request, user_id=user.id))
+
+    def change_asset(self, method):
+        user = self.users["writer"]
+        path = f"/users/{user.id}/assets/crypto-0"
+        request = getattr(self.factory, method)(
+            path, data={"amount": 2.5}, content_type="application/json"
+        )
+        request.user = user
+
+        _check(
+            async_to_sync(AssetManagementView.as_view())(
+                request, user_id=user.id, crypto="crypto-0"
+            )
+        )
+
+    def crypto_list(self):
+        request = self.factory.get("/cryptos")
+        request.user = self.users[1]
+
+        _check(async_to_sync(CryptoListView.as_view())(request))
+
+    def login(self):
+        request = self.factory.post(
+            "/login",
+            data={"username": "bench-1", "password": PASSWORD, "token": True},
+            content_type="application/json",
+        )
+
+        _check(login_user(request))
+
+    def json_response(self):
+        JsonResponse(self.payload)
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    Returns the calls per second of func, the best of `repeat` rounds of at least
+    `min_time` seconds, and the peak memory in KiB allocated during one call.
+    """
+    number = 1
+    duration = _time(func, number)
+    while duration < min_time:
+        number = max(number * 2, int(number * min_time / max(duration, 1e-9)))
+        duration = _time(func, number)
+
+    best = min([duration] + [_time(func, number) for _ in range(repeat - 1)])
+
+    tracemalloc.start()
+    try:
+        func()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_second": round(number / best, 1),
+        "peak_kib": round((peak - current) / 1024, 1),
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Returns a description of every benchmark of the baseline whose calls per second
+    dropped, or whose peak memory grew, by more than `threshold` (e.g. 0.25 for 25%).
+    """
+    regressions = []
+
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            continue
+
+        limit = expected["ops_per_second"] * (1 - threshold)
+        if actual["ops_per_second"] < limit:
+            regressions.append(
+                f"{name}: {actual['ops_per_second']} ops/s < {limit:.1f} ops/s"
+            )
+
+        # Plus one KiB, so small allocations do not regress by noise
+        limit = expected["peak_kib"] * (1 + threshold) + 1
+        if actual["peak_kib"] > limit:
+            regressions.append(f"{name}: {actual['peak_kib']} KiB > {limit:.1f} KiB")
+
+    return regressions
+
+
+def _check(response):
+    # A benchmark of an error response would measure the wrong code path
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark responded with {response.status_code}")
+
+    return response
+
+
+def _time(func, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+
+    return time.perf_counter() - started
@@ -0,0 +1,35 @@
+# Settings of a server under load test, started with
+# DJANGO_SETTINGS_MODULE=benchmarks.settings
+import os
+
+from crypto_assets_server.settings import *  # noqa: F401, F403
+from crypto_assets_server.settings import BASE_DIR, PRICE_PROVIDER
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+# Users created by load tests are kept out of the development database
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "loadtest.sqlite3",
+    }
+}
+
+# Prices come from the Binance stub server started by `manage.py loadtest`
+PRICE_PROVIDER = {
+    **PRICE_PROVIDER,
+    "OPTIONS": {
+        **PRICE_PROVIDER["OPTIONS"],
+        "base_url": os.environ.get("PRICE_STUB_URL", "http://127.0.0.1:8001"),
+    },
+}
+
+# All virtual users of a load test register and log in from the same IP
+AUTH_THROTTLE = {
+    "ip": {"capacity": 1_000_000, "refill_seconds": 0.001},
+    "username": {"capacity": 5, "refill_seconds": 60},
+}
+
+QUERY_BUDGET_STRICT = False
@@ -0,0 +1,112 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from crypto_assets_server.database import apply_sqlite_pragmas
+from .loadtest import percentile
+
+SCHEMA = (
+    "CREATE TABLE asset ("
+    "crypto_id INTEGER NOT NULL, user_id INTEGER NOT NULL, amount REAL NOT NULL, "
+    "updated_at TEXT NOT NULL, UNIQUE (crypto_id, user_id))"
+)
+# Same statement as AssetManager.upsert_amounts()
+UPSERT = (
+    "INSERT INTO asset (crypto_id, user_id, amount, updated_at) "
+    "VALUES (?, ?, ?, datetime('now')) "
+    "ON CONFLICT (crypto_id, user_id) DO UPDATE SET "
+    "amount = asset.amount + excluded.amount, updated_at = excluded.updated_at"
+)
+SELECT = "SELECT crypto_id, amount FROM asset WHERE user_id = ? ORDER BY crypto_id"
+CRYPTOS = 100
+
+# Timeout of connections opened by Django's SQLite backend without OPTIONS
+DEFAULT_TIMEOUT = 5
+
+
+def run_write_benchmark(path, pragmas, writers, readers, duration):
+    """
+    Runs `writers` threads incrementing assets in transactions of their own next to
+    `readers` threads listing assets, each with its own connection to a new SQLite
+    database at `path` configured with `pragmas`, for `duration` seconds. Returns
+    writes and reads per second, write latency and the number of writes that failed
+    with "database is locked".
+    """
+    with _connect(path, pragmas) as connection:
+        connection.execute(SCHEMA)
+
+    latencies = []
+    counts = {"reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def write(user_id):
+        connection = _connect(path, pragmas)
+        rng = random.Random(user_id)
+
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.execute("BEGIN")
+                connection.execute(UPSERT, (rng.randrange(CRYPTOS), user_id, 1.0))
+                connection.execute("COMMIT")
+            except sqlite3.OperationalError as err:
+                if "locked" not in str(err):
+                    raise
+
+                connection.rollback()
+                with lock:
+                    counts["locked"] += 1
+                continue
+
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+        connection.close()
+
+    def read(user_id):
+        connection = _connect(path, pragmas)
+        reads = 0
+
+        while time.monotonic() < deadline:
+            connection.execute(SELECT, (user_id,)).fetchall()
+            reads += 1
+
+        connection.close()
+        with lock:
+            counts["reads"] += reads
+
+    threads = [
+        threading.Thread(target=write, args=(index,)) for index in range(writers)
+    ] + [threading.Thread(target=read, args=(index,)) for index in range(readers)]
+
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    return {
+        "writes_per_second": round(len(latencies) / elapsed, 1),
+        "reads_per_second": round(counts["reads"] / elapsed, 1),
+        "locked_errors": counts["locked"],
+        "write_latency_ms": {
+            name: round(percentile(latencies, percent) * 1000, 2)
+            for name, percent in (("p50", 50), ("p95", 95), ("p99", 99))
+        },
+    }
+
+
+def _connect(path, pragmas):
+    # Transactions are started explicitly, like Django does in autocommit mode
+    connection = sqlite3.connect(
+        os.fspath(path), timeout=DEFAULT_TIMEOUT, isolation_level=None
+    )
+    apply_sqlite_pragmas(connection, pragmas)
+
+    return connection
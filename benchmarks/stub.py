@@ -0,0 +1,116 @@
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TICKER_PATH = "/api/v3/ticker/price"
+
+
+class BinanceStubServer:
+    """
+    Local HTTP server imitating the Binance ticker endpoint, so load tests never call
+    the real API. Every response is delayed by `latency` seconds, and a share of
+    `error_rate` requests fails with status 500. Symbols without a configured price
+    get a stable made-up price.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0, error_rate=0, prices=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.prices = dict(prices or {})
+        self.requests = 0
+
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def price(self, symbol):
+        if symbol in self.prices:
+            return self.prices[symbol]
+
+        # Stable per symbol, so repeated load tests see the same prices
+        return f"{100 + zlib.crc32(symbol.encode()) % 100000 / 10:.8f}"
+
+    def respond(self, query):
+        """
+        Returns the status and body of a ticker request with the given query
+        parameters.
+        """
+        with self._lock:
+            self.requests += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if random.random() < self.error_rate:
+            return 500, {"code": -1000, "msg": "An unknown error occurred."}
+
+        if "symbols" in query:
+            try:
+                symbols = json.loads(query["symbols"][0])
+            except ValueError:
+                return 400, {"code": -1100, "msg": "Illegal characters found."}
+
+            return 200, [
+                {"symbol": symbol, "price": self.price(symbol)} for symbol in symbols
+            ]
+
+        if "symbol" in query:
+            symbol = query["symbol"][0]
+            return 200, {"symbol": symbol, "price": self.price(symbol)}
+
+        return 200, [
+            {"symbol": symbol, "price": price} for symbol, price in self.prices.items()
+        ]
+
+
+def _make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+
+            if url.path == TICKER_PATH:
+                status, data = stub.respond(parse_qs(url.query))
+            else:
+                status, data = 404, {"code": -1, "msg": "Not found."}
+
+            body = json.dumps(data).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
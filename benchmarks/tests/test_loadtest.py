@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from io import StringIO
+import requests
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+
+from benchmarks.loadtest import compare_to_baseline, percentile, run_load_test
+from benchmarks.stub import TICKER_PATH, BinanceStubServer
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto
+from cryptos.providers import BinancePriceProvider, PriceUnavailableError
+
+
+def _report(p95, p99, requests_per_second):
+    return {
+        "endpoints": {
+            "crypto-price": {
+                "requests": 100,
+                "errors": 0,
+                "requests_per_second": requests_per_second,
+                "latency_ms": {"p50": 10, "p95": p95, "p99": p99},
+            }
+        }
+    }
+
+
+class BinanceStubServerTestCase(TestCase):
+    def setUp(self):
+        self.stub = BinanceStubServer(prices={"BTCEUR": "1000.00000000"}).start()
+        self.addCleanup(self.stub.stop)
+
+    def test_provider_fetches_prices_from_stub(self):
+        provider = BinancePriceProvider(base_url=self.stub.url)
+
+        self.assertEqual(provider.fetch_price("BTCEUR"), "1000.00000000")
+
+        prices = provider.fetch_prices(["BTCEUR", "ETHEUR"])
+
+        self.assertEqual(prices["BTCEUR"], "1000.00000000")
+        # Symbols without a configured price get a stable made-up price
+        self.assertEqual(prices["ETHEUR"], provider.fetch_price("ETHEUR"))
+        self.assertEqual(self.stub.requests, 3)
+
+    def test_stub_fails_with_error_rate(self):
+        self.stub.error_rate = 1
+        provider = BinancePriceProvider(base_url=self.stub.url)
+
+        with self.assertRaisesMessage(
+            PriceUnavailableError, "Upstream responded with 500"
+        ):
+            provider.fetch_price("BTCEUR")
+
+    def test_stub_responds_after_latency(self):
+        self.stub.latency = 0.2
+
+        response = requests.get(
+            self.stub.url + TICKER_PATH, params={"symbol": "BTCEUR"}, timeout=5
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.elapsed.total_seconds(), 0.2)
+
+    def test_unknown_path_is_not_found(self):
+        response = requests.get(self.stub.url + "/api/v3/depth", timeout=5)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class BaselineTestCase(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 99), 0)
+
+    def test_report_within_tolerance_has_no_regressions(self):
+        regressions = compare_to_baseline(
+            _report(p95=23, p99=35, requests_per_second=85),
+            _report(p95=20, p99=30, requests_per_second=100),
+            tolerance=0.2,
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test_slower_report_has_regressions(self):
+        regressions = compare_to_baseline(
+            _report(p95=30, p99=30, requests_per_second=70),
+            _report(p95=20, p99=30, requests_per_second=100),
+            tolerance=0.2,
+        )
+
+        self.assertEqual(
+            regressions,
+            [
+                "crypto-price: p95 latency 30 ms > 24.0 ms",
+                "crypto-price: 70 requests/s < 80.0 requests/s",
+            ],
+        )
+
+    def test_missing_endpoint_is_regression(self):
+        regressions = compare_to_baseline(
+            {"endpoints": {}}, _report(20, 30, 100), tolerance=0.2
+        )
+
+        self.assertEqual(regressions, ["crypto-price: no requests"])
+
+
+class LoadTestTestCase(LiveServerTestCase):
+    def setUp(self):
+        cache.clear()
+        get_breaker().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        self.stub = BinanceStubServer().start()
+        self.addCleanup(self.stub.stop)
+
+        provider = override_settings(
+            PRICE_PROVIDER={
+                "BACKEND": "cryptos.providers.BinancePriceProvider",
+                "OPTIONS": {"base_url": self.stub.url},
+            }
+        )
+        provider.enable()
+        self.addCleanup(provider.disable)
+
+    def test_load_test_reports_every_endpoint(self):
+        report = run_load_test(self.live_server_url, concurrency=2, duration=2, seed=1)
+
+        self.assertEqual(report["logged_in_users"], 2)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertGreater(self.stub.requests, 0)
+
+        for endpoint in ("register", "login", "cryptos", "crypto-price"):
+            stats = report["endpoints"][endpoint]
+
+            self.assertGreater(stats["requests"], 0)
+            self.assertLessEqual(stats["latency_ms"]["p50"], stats["latency_ms"]["p99"])
+
+    def test_command_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            with open(path, "w") as file:
+                json.dump(_report(p95=0.001, p99=0.001, requests_per_second=1), file)
+
+            # Which endpoints a one second run reaches depends on the traffic mix, but
+            # every one reached is slower than the baseline
+            with self.assertRaisesMessage(CommandError, "Regressions against baseline"):
+                call_command(
+                    "loadtest",
+                    url=self.live_server_url,
+                    concurrency=1,
+                    duration=1,
+                    no_stub=True,
+                    baseline=path,
+                    stdout=StringIO(),
+                )
+
+    def test_command_fails_without_server(self):
+        with self.assertRaisesMessage(CommandError, "No virtual user could register"):
+            call_command(
+                "loadtest",
+                url="http://127.0.0.1:9",
+                concurrency=1,
+                duration=1,
+                no_stub=True,
+                stdout=StringIO(),
+            )
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from benchmarks.management.commands.benchmark import AUTH_THROTTLE
+from benchmarks.micro import Benchmarks, compare_to_baseline, measure
+
+
+class MicroBenchmarksTestCase(TestCase):
+    @override_settings(AUTH_THROTTLE=AUTH_THROTTLE)
+    def test_every_benchmark_runs(self):
+        cache.clear()
+
+        benchmarks = Benchmarks()
+        benchmarks.setup()
+
+        self.assertEqual(len(benchmarks.payload["assets"]), 100)
+
+        for name, func in benchmarks.all().items():
+            with self.subTest(name=name):
+                func()
+
+    def test_measure(self):
+        result = measure(lambda: [0] * 10_000, min_time=0.01, repeat=2)
+
+        self.assertGreater(result["ops_per_second"], 0)
+        # A list of 10,000 references takes about 78 KiB
+        self.assertGreater(result["peak_kib"], 70)
+
+    def test_results_within_threshold_have_no_regressions(self):
+        regressions = compare_to_baseline(
+            {"login": {"ops_per_second": 80, "peak_kib": 12}},
+            {"login": {"ops_per_second": 100, "peak_kib": 10}},
+            threshold=0.25,
+        )
+
+        self.assertEqual(regressions, [])
+
+    def test_slower_and_larger_results_are_regressions(self):
+        regressions = compare_to_baseline(
+            {
+                "login": {"ops_per_second": 70, "peak_kib": 10},
+                "json-response-100-assets": {"ops_per_second": 100, "peak_kib": 20},
+                "new-benchmark": {"ops_per_second": 1, "peak_kib": 1000},
+            },
+            {
+                "login": {"ops_per_second": 100, "peak_kib": 10},
+                "json-response-100-assets": {"ops_per_second": 100, "peak_kib": 10},
+            },
+            threshold=0.25,
+        )
+
+        self.assertEqual(
+            regressions,
+            [
+                "login: 70 ops/s < 75.0 ops/s",
+                "json-response-100-assets: 20 KiB > 13.5 KiB",
+            ],
+        )
@@ -0,0 +1,25 @@
+import tempfile
+from django.test import SimpleTestCase
+
+from benchmarks.sqlite import run_write_benchmark
+
+
+class SqliteWriteBenchmarkTestCase(SimpleTestCase):
+    def test_benchmark_reports_writes_and_reads(self):
+        pragmas = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_write_benchmark(
+                f"{directory}/bench.sqlite3",
+                pragmas,
+                writers=2,
+                readers=1,
+                duration=0.2,
+            )
+
+        self.assertGreater(result["writes_per_second"], 0)
+        self.assertGreater(result["reads_per_second"], 0)
+        self.assertEqual(result["locked_errors"], 0)
+        self.assertLessEqual(
+            result["write_latency_ms"]["p50"], result["write_latency_ms"]["p99"]
+        )
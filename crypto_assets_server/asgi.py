@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crypto_assets_server.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from cryptos.stream import StreamDisconnectMiddleware  # noqa: E402
+
+application = StreamDisconnectMiddleware(django_application)
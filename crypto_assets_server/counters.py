@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+
+class CacheCounters:
+    """
+    Named counters kept in the default cache, so all workers sharing the cache count
+    together. Counters never expire, but may be evicted by the cache.
+    """
+
+    def __init__(self, prefix, names):
+        self.prefix = prefix
+        self.names = tuple(names)
+
+    def increment(self, name, delta=1):
+        if delta == 0:
+            return
+
+        key = self._key(name)
+
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Counter was evicted between add() and incr()
+            cache.set(key, delta, timeout=None)
+
+    async def aincrement(self, name, delta=1):
+        # BaseCache.aincr() is a non-atomic get and set, so concurrent increments of
+        # backends without a native async incr() would be lost
+        await sync_to_async(self.increment, thread_sensitive=False)(name, delta)
+
+    def values(self):
+        """
+        Returns a dict mapping the name of every counter to its value.
+        """
+        keys = {self._key(name): name for name in self.names}
+        values = cache.get_many(keys.keys())
+
+        return {name: values.get(key, 0) for key, name in keys.items()}
+
+    def _key(self, name):
+        return f"{self.prefix}:stats:{name}"
@@ -0,0 +1,22 @@
+from datetime import timezone
+
+from django.utils import timezone as django_timezone
+from django.utils.dateparse import parse_datetime
+
+
+def parse_aware_datetime(value):
+    """
+    Returns the aware datetime of an ISO 8601 string, or None for None. Naive values
+    are in UTC. Raises ValueError if the value is malformed or not a valid datetime.
+    """
+    if value is None:
+        return None
+
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid datetime {value}")
+
+    if django_timezone.is_naive(parsed):
+        parsed = django_timezone.make_aware(parsed, timezone.utc)
+
+    return parsed
@@ -0,0 +1,32 @@
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+def async_condition(etag_func):
+    """
+    Counterpart of django.views.decorators.http.condition(etag_func=...) for async
+    handlers of class-based views, which Django 4.2 does not support. etag_func is
+    awaited with the same arguments as the view.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def inner(self, request, *args, **kwargs):
+            etag = await etag_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+
+            response = get_conditional_response(request, etag=etag)
+
+            if response is None:
+                response = await handler(self, request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD") and etag:
+                response.headers.setdefault("ETag", etag)
+
+            return response
+
+        return inner
+
+    return decorator
@@ -0,0 +1,353 @@
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# View label of upstream calls made outside of requests, e.g. background revalidation
+BACKGROUND_VIEW = "background"
+UNMATCHED_VIEW = "unmatched"
+
+# Clients choose the method, so any other one is recorded as OTHER_METHOD to keep the
+# number of series bounded
+HTTP_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+)
+OTHER_METHOD = "other"
+
+COUNTER_HELP = {
+    "http_requests_total": "Requests per view, method and status",
+    "db_queries_total": "Database queries run while handling requests",
+    "db_query_duration_seconds_total": "Time spent in database queries",
+    "upstream_requests_total": "Requests to the upstream price API",
+    "upstream_request_duration_seconds_total": "Time spent waiting for the upstream price API",
+}
+HISTOGRAM_HELP = {
+    "http_request_duration_seconds": "Time to handle a request",
+}
+
+_current_request = ContextVar("request_metrics", default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.upstream_requests = 0
+        self.upstream_time = 0.0
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms of the current process. Updates take one short lock per
+    request. With settings.METRICS_MULTIPROCESS_DIR, every process regularly writes its
+    values to a file in that directory, and collect() adds up the files of all
+    processes, e.g. of all gunicorn workers.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.file_name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self._lock = threading.Lock()
+        self._last_flush = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # (name, labels) -> value
+            self._counters = defaultdict(float)
+            # (name, labels) -> [count per bucket..., count above last bucket, sum]
+            self._histograms = {}
+
+    def observe_request(self, view, method, status, duration, stats):
+        with self._lock:
+            self._counters[
+                (
+                    "http_requests_total",
+                    (("view", view), ("method", method), ("status", str(status))),
+                )
+            ] += 1
+            self._observe_histogram(
+                "http_request_duration_seconds", (("view", view),), duration
+            )
+            self._add_stats(view, stats)
+
+        self._maybe_flush()
+
+    def observe_upstream(self, view, duration):
+        stats = RequestStats()
+        stats.upstream_requests = 1
+        stats.upstream_time = duration
+
+        with self._lock:
+            self._add_stats(view, stats)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in self._counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+            }
+
+    def collect(self):
+        """
+        Returns the snapshots of this process and, in multiprocess mode, of all other
+        processes that wrote to METRICS_MULTIPROCESS_DIR.
+        """
+        snapshots = [self.snapshot()]
+
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if directory is None:
+            return snapshots
+
+        self.flush()
+
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(".json") or file_name == self.file_name:
+                continue
+
+            try:
+                with open(os.path.join(directory, file_name), encoding="utf-8") as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                # Removed or being replaced by its process
+                continue
+
+        return snapshots
+
+    def flush(self):
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if directory is None:
+            return
+
+        path = os.path.join(directory, self.file_name)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f"{path}.tmp", path)
+
+        self._last_flush = time.monotonic()
+
+    def _maybe_flush(self):
+        if settings.METRICS_MULTIPROCESS_DIR is None:
+            return
+
+        if time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def _add_stats(self, view, stats):
+        labels = (("view", view),)
+
+        if stats.db_queries:
+            self._counters[("db_queries_total", labels)] += stats.db_queries
+            self._counters[("db_query_duration_seconds_total", labels)] += stats.db_time
+
+        if stats.upstream_requests:
+            self._counters[
+                ("upstream_requests_total", labels)
+            ] += stats.upstream_requests
+            self._counters[
+                ("upstream_request_duration_seconds_total", labels)
+            ] += stats.upstream_time
+
+    def _observe_histogram(self, name, labels, value):
+        values = self._histograms.get((name, labels))
+        if values is None:
+            values = self._histograms[(name, labels)] = [0] * (len(self.buckets) + 2)
+
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                values[index] += 1
+                break
+        else:
+            values[len(self.buckets)] += 1
+
+        values[-1] += value
+
+
+def render_prometheus(snapshots, buckets):
+    """
+    Adds up the given snapshots and renders them in the Prometheus text format.
+    """
+    counters = defaultdict(float)
+    histograms = {}
+
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            counters[(name, _labels_key(labels))] += value
+
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, _labels_key(labels))
+            if key not in histograms:
+                histograms[key] = [0] * len(values)
+            histograms[key] = [a + b for a, b in zip(histograms[key], values)]
+
+    lines = []
+
+    for metric, help_text in COUNTER_HELP.items():
+        series = sorted(key for key in counters if key[0] == metric)
+        if not series:
+            continue
+
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for key in series:
+            lines.append(
+                f"{metric}{_format_labels(key[1])} {_format_value(counters[key])}"
+            )
+
+    for metric, help_text in HISTOGRAM_HELP.items():
+        series = sorted(key for key in histograms if key[0] == metric)
+        if not series:
+            continue
+
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for key in series:
+            values = histograms[key]
+            labels = key[1]
+
+            cumulative = 0
+            for bound, count in zip(buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format_value(bound)
+                lines.append(
+                    f"{metric}_bucket{_format_labels(labels + (('le', le),))} {cumulative}"
+                )
+
+            lines.append(
+                f"{metric}_sum{_format_labels(labels)} {_format_value(values[-1])}"
+            )
+            lines.append(f"{metric}_count{_format_labels(labels)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+def start_request():
+    return _current_request.set(RequestStats())
+
+
+def current_request_stats():
+    """
+    Returns the RequestStats of the request handled in the current context, or None
+    outside of requests.
+    """
+    return _current_request.get()
+
+
+def finish_request(token, request, status, duration):
+    stats = _current_request.get()
+    _current_request.reset(token)
+
+    match = getattr(request, "resolver_match", None)
+    view = match.url_name if match is not None and match.url_name else UNMATCHED_VIEW
+
+    method = request.method if request.method in HTTP_METHODS else OTHER_METHOD
+
+    get_registry().observe_request(view, method, status, duration, stats)
+
+
+def record_upstream_call(duration):
+    """
+    Attributes an upstream call to the current request, or to BACKGROUND_VIEW if it was
+    made outside of a request.
+    """
+    stats = _current_request.get()
+    if stats is None:
+        get_registry().observe_upstream(BACKGROUND_VIEW, duration)
+        return
+
+    stats.upstream_requests += 1
+    stats.upstream_time += duration
+
+
+def install_query_recorder():
+    """
+    Makes the already open database connections of this thread record their queries.
+    Connections opened later install it through the connection_created signal.
+    """
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _install(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@receiver(connection_created)
+def _install_on_new_connection(*, connection, **kwargs):
+    _install(connection)
+
+
+def _labels_key(labels):
+    return tuple(tuple(label) for label in labels)
+
+
+def _format_labels(labels):
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+_registry = None
+_registry_pid = None
+
+
+def get_registry():
+    """
+    Returns the metrics registry of this process. Forked workers start with an empty
+    registry instead of counting the values of their parent twice.
+    """
+    global _registry, _registry_pid
+
+    if _registry is None or _registry_pid != os.getpid():
+        _registry = MetricsRegistry(settings.METRICS_LATENCY_BUCKETS)
+        _registry_pid = os.getpid()
+
+    return _registry
+
+
+@receiver(setting_changed)
+def _reset_registry(*, setting, **kwargs):
+    global _registry
+
+    if setting in ("METRICS_LATENCY_BUCKETS", "METRICS_MULTIPROCESS_DIR"):
+        _registry = None
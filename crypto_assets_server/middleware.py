@@ -0,0 +1,160 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .metrics import (
+    current_request_stats,
+    finish_request,
+    install_query_recorder,
+    start_request,
+)
+from .profiling import PROFILE_HEADER, RequestProfile, requested_by_staff, sampled
+from .query_budget import check_query_budget
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, database queries and upstream price API calls of every
+    request by the name of the URL pattern it resolved to.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        install_query_recorder()
+
+        started = time.perf_counter()
+        token = start_request()
+
+        response = self.get_response(request)
+
+        finish_request(
+            token, request, response.status_code, time.perf_counter() - started
+        )
+
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        token = start_request()
+
+        response = await self.get_response(request)
+
+        finish_request(
+            token, request, response.status_code, time.perf_counter() - started
+        )
+
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Checks the database queries run by the view against the query budget declared by
+    the view. The queries are counted by MetricsMiddleware, which has to come first.
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = current_request_stats()
+        if stats is None:
+            return self.get_response(request)
+
+        queries = stats.db_queries
+        response = self.get_response(request)
+        check_query_budget(request, stats.db_queries - queries)
+
+        return response
+
+    async def __acall__(self, request):
+        stats = current_request_stats()
+        if stats is None:
+            return await self.get_response(request)
+
+        queries = stats.db_queries
+        response = await self.get_response(request)
+        check_query_budget(request, stats.db_queries - queries)
+
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests with cProfile if settings.PROFILING is enabled and the request
+    is either sent by a staff user with an X-Profile header or picked by the sample
+    rate. Profiles under ASGI also contain other work done on the event loop while the
+    request is handled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING["ENABLED"]:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        requested = requested_by_staff(request)
+        if not requested and not sampled():
+            return self.get_response(request)
+
+        profile = RequestProfile(summary_header=requested)
+        if not profile.start():
+            return self.get_response(request)
+
+        response = self.get_response(request)
+
+        profile.stop()
+        profile.save(request, response)
+
+        return response
+
+    async def __acall__(self, request):
+        # Looking up a session user cannot be done from the event loop
+        requested = PROFILE_HEADER in request.headers and await sync_to_async(
+            requested_by_staff
+        )(request)
+        if not requested and not sampled():
+            return await self.get_response(request)
+
+        profile = RequestProfile(summary_header=requested)
+        if not profile.start():
+            return await self.get_response(request)
+
+        # Sync views and their database queries run in a thread of their own
+        await sync_to_async(profile.enable)()
+        response = await self.get_response(request)
+        await sync_to_async(profile.disable)()
+
+        profile.stop()
+        await sync_to_async(profile.save)(request, response)
+
+        return response
@@ -1,23 +1,86 @@
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 
+from auth.tokens import InvalidTokenError, bearer_token, verify_access_token
+
 
 class CustomLoginRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            return JsonResponse({"error": "Authentication required"}, status=401)
+        if self.view_is_async:
+            return self._dispatch_async(request, *args, **kwargs)
+
+        response = self._authenticate(request)
+        if response is not None:
+            return response
 
         return super().dispatch(request, *args, **kwargs)
 
+    async def _dispatch_async(self, request, *args, **kwargs):
+        # A session login is looked up in the database, which cannot be done from the
+        # event loop. Access tokens are verified without leaving it.
+        if bearer_token(request) is not None:
+            response = self._authenticate(request)
+        else:
+            response = await sync_to_async(self._authenticate)(request)
+
+        if response is not None:
+            return response
+
+        return await super().dispatch(request, *args, **kwargs)
+
+    def _authenticate(self, request):
+        # Requests with an access token are authenticated from the token alone, which
+        # skips the session and user lookups of a session login
+        token = bearer_token(request)
+        if token is not None:
+            try:
+                request.user = verify_access_token(token)
+            except InvalidTokenError:
+                return JsonResponse(
+                    {"error": "Invalid or expired access token"}, status=401
+                )
+        elif not request.user.is_authenticated:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        return None
+
 
 class UserAccessOwnResourcesMixin:
+    # request.user was loaded by CustomLoginRequiredMixin, so checking it does not
+    # touch the database, also not in async views
     def dispatch(self, request, *args, **kwargs):
         user_id = kwargs["user_id"]
         if request.user.id != user_id:
-            return JsonResponse(
-                {
-                    "error": "User has no permissions to perform operations on resources of other users"
-                },
-                status=403,
+            return _response(
+                self,
+                JsonResponse(
+                    {
+                        "error": "User has no permissions to perform operations on resources of other users"
+                    },
+                    status=403,
+                ),
+            )
+
+        return super().dispatch(request, *args, **kwargs)
+
+
+class StaffRequiredMixin:
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_staff:
+            return _response(
+                self, JsonResponse({"error": "Staff privileges required"}, status=403)
             )
 
         return super().dispatch(request, *args, **kwargs)
+
+
+def _response(view, response):
+    # Async views have to return an awaitable from dispatch
+    if view.view_is_async:
+
+        async def func():
+            return response
+
+        return func()
+
+    return response
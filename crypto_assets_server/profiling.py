@@ -0,0 +1,133 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+from auth.tokens import InvalidTokenError, bearer_token, verify_access_token
+
+PROFILE_HEADER = "X-Profile"
+SUMMARY_HEADER = "X-Profile-Summary"
+UNMATCHED_VIEW = "unmatched"
+
+# Only one profiler can be active per process, so overlapping requests are not profiled
+_lock = threading.Lock()
+
+
+def sampled():
+    return random.random() < settings.PROFILING["SAMPLE_RATE"]
+
+
+def requested_by_staff(request):
+    """
+    Returns whether the request asks to be profiled with the X-Profile header and is
+    made by a staff user. Only touches the session if the header is present.
+    """
+    if PROFILE_HEADER not in request.headers:
+        return False
+
+    token = bearer_token(request)
+    if token is not None:
+        try:
+            return verify_access_token(token).is_staff
+        except InvalidTokenError:
+            return False
+
+    return request.user.is_staff
+
+
+class RequestProfile:
+    """
+    Profiles the handling of a single request with cProfile. A profiler only sees the
+    thread it was enabled in, so one is enabled per thread the request runs in, e.g.
+    the event loop and the thread of sync views under ASGI. Nothing is profiled while
+    another request of this process is being profiled.
+    """
+
+    def __init__(self, summary_header=False):
+        self.summary_header = summary_header
+        # Thread id -> profiler
+        self._profilers = {}
+
+    def start(self):
+        if not _lock.acquire(blocking=False):
+            return False
+
+        self.enable()
+
+        return True
+
+    def stop(self):
+        self.disable()
+        _lock.release()
+
+    def enable(self):
+        profiler = cProfile.Profile()
+        self._profilers[threading.get_ident()] = profiler
+        profiler.enable()
+
+    def disable(self):
+        self._profilers[threading.get_ident()].disable()
+
+    def save(self, request, response):
+        summary = io.StringIO()
+        stats = pstats.Stats(*self._profilers.values(), stream=summary)
+        path = dump_profile(stats, summary, request)
+
+        # The summary reveals code paths, so it is only returned to staff
+        if self.summary_header and settings.PROFILING["SUMMARY_HEADER"]:
+            response[SUMMARY_HEADER] = summary_header(stats)
+            response["X-Profile-File"] = os.path.basename(path)
+
+
+def dump_profile(stats, summary, request):
+    """
+    Writes the stats to <url-name>-<timestamp>.pstats in settings.PROFILING["DIR"],
+    next to a .txt file with the top functions by cumulative time, which the stats print
+    to `summary`. Returns the path of the .pstats file.
+    """
+    match = getattr(request, "resolver_match", None)
+    view = match.url_name if match is not None and match.url_name else UNMATCHED_VIEW
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+    directory = settings.PROFILING["DIR"]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{view}-{timestamp}")
+
+    stats.dump_stats(path + ".pstats")
+
+    summary.write(f"{request.method} {request.get_full_path()}\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILING["TOP"])
+
+    with open(path + ".txt", "w") as file:
+        file.write(summary.getvalue())
+
+    return path + ".pstats"
+
+
+def top_functions(stats, limit):
+    """
+    Returns (cumulative time, calls, function) of the `limit` functions with the highest
+    cumulative time.
+    """
+    functions = [
+        (cumulative, calls, pstats.func_std_string(func))
+        for func, (_, calls, _, cumulative, _) in stats.stats.items()
+    ]
+    functions.sort(reverse=True)
+
+    return functions[:limit]
+
+
+def summary_header(stats):
+    # Header values cannot contain line breaks
+    return "; ".join(
+        f"{cumulative:.4f}s {calls}x {function}"
+        for cumulative, calls, function in top_functions(
+            stats, settings.PROFILING["TOP"]
+        )
+    )
@@ -0,0 +1,68 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(queries):
+    """
+    Declares the maximum number of database queries of a function view. Class-based
+    views declare it with a `query_budget` class attribute instead. A budget is either
+    a number or a dict mapping HTTP methods to numbers.
+    """
+
+    def decorator(view):
+        view.query_budget = queries
+        return view
+
+    return decorator
+
+
+def get_query_budget(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+
+    view = getattr(match.func, "view_class", match.func)
+    budget = getattr(view, "query_budget", None)
+
+    if isinstance(budget, dict):
+        return budget.get(request.method)
+
+    return budget
+
+
+def check_query_budget(request, queries):
+    """
+    Raises QueryBudgetExceeded with settings.QUERY_BUDGET_STRICT, and logs a warning
+    otherwise, if the view of the request ran more queries than its budget.
+    """
+    budget = get_query_budget(request)
+    if budget is None or queries <= budget:
+        return
+
+    view = request.resolver_match.url_name
+
+    if settings.QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(
+            f"View {view} ran {queries} queries, its budget is {budget}"
+        )
+
+    logger.warning(
+        "View %s ran %d queries, its budget is %d",
+        view,
+        queries,
+        budget,
+        extra={
+            "view": view,
+            "method": request.method,
+            "path": request.path,
+            "queries": queries,
+            "query_budget": budget,
+        },
+    )
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from crypto_assets_server.metrics import get_registry
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+        get_registry().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com", is_staff=True
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _get_metrics(self):
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+
+        return response.content.decode()
+
+    def _counters(self, name):
+        return {
+            tuple(map(tuple, labels)): value
+            for metric, labels, value in get_registry().snapshot()["counters"]
+            if metric == name
+        }
+
+    def test_requests_are_counted_by_view_and_status(self):
+        self.client.get(reverse("cryptos"))
+        self.client.get(reverse("cryptos"))
+        self.client.get(reverse("crypto-price", kwargs={"crypto": "unknown"}))
+
+        requests = self._counters("http_requests_total")
+
+        self.assertEqual(
+            requests[(("view", "cryptos"), ("method", "GET"), ("status", "200"))], 2
+        )
+        self.assertEqual(
+            requests[(("view", "crypto-price"), ("method", "GET"), ("status", "404"))],
+            1,
+        )
+
+    def test_unknown_methods_are_counted_as_other(self):
+        self.client.generic("FOO123", reverse("cryptos"))
+        self.client.generic("BAR456", reverse("cryptos"))
+
+        requests = self._counters("http_requests_total")
+
+        self.assertEqual(
+            {labels[1] for labels in requests}, {("method", "other")}, requests
+        )
+        self.assertEqual(sum(requests.values()), 2)
+
+    def test_database_queries_are_recorded(self):
+        self.client.get(reverse("list-assets", kwargs={"user_id": self.user.id}))
+
+        queries = self._counters("db_queries_total")
+
+        self.assertGreater(queries[(("view", "list-assets"),)], 0)
+
+    @patch("requests.Session.get")
+    def test_upstream_calls_are_recorded(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        self.client.get(reverse("crypto-price", kwargs={"crypto": "bitcoin"}))
+
+        self.assertEqual(
+            self._counters("upstream_requests_total"), {(("view", "crypto-price"),): 1}
+        )
+        self.assertIn(
+            (("view", "crypto-price"),),
+            self._counters("upstream_request_duration_seconds_total"),
+        )
+
+    def test_metrics_in_prometheus_format(self):
+        self.client.get(reverse("cryptos"))
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+
+        metrics = response.content.decode()
+        self.assertIn("# TYPE http_requests_total counter", metrics)
+        self.assertIn(
+            'http_requests_total{view="cryptos",method="GET",status="200"} 1', metrics
+        )
+        self.assertIn("# TYPE http_request_duration_seconds histogram", metrics)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{view="cryptos",le="+Inf"} 1', metrics
+        )
+        self.assertIn('http_request_duration_seconds_count{view="cryptos"} 1', metrics)
+
+    def test_metrics_of_all_processes_are_added_up(self):
+        other_process = {
+            "counters": [
+                [
+                    "http_requests_total",
+                    [["view", "cryptos"], ["method", "GET"], ["status", "200"]],
+                    4,
+                ]
+            ],
+            "histograms": [],
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "1234-abcd.json"), "w") as file:
+                json.dump(other_process, file)
+
+            with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+                self.client.get(reverse("cryptos"))
+                metrics = self._get_metrics()
+
+                self.assertTrue(
+                    os.path.exists(os.path.join(directory, get_registry().file_name))
+                )
+
+        self.assertIn(
+            'http_requests_total{view="cryptos",method="GET",status="200"} 5', metrics
+        )
+
+    def test_non_staff_user_cannot_get_metrics(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,122 @@
+import glob
+import os
+import pstats
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.models import Crypto
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        self.settings = override_settings(
+            PROFILING={
+                "ENABLED": True,
+                "SAMPLE_RATE": 0,
+                "DIR": self.directory,
+                "TOP": 5,
+                "SUMMARY_HEADER": True,
+            }
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com", is_staff=True
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+        self.async_client.force_login(self.user)
+
+    def _profiles(self, view):
+        return sorted(glob.glob(os.path.join(self.directory, f"{view}-*.pstats")))
+
+    def _profiled_functions(self, view):
+        (path,) = self._profiles(view)
+
+        return {func for _, _, func in pstats.Stats(path).stats}
+
+    def test_staff_user_profiles_request_with_header(self):
+        response = self.client.get(reverse("cryptos"), HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, 200)
+
+        (path,) = self._profiles("cryptos")
+        self.assertEqual(response["X-Profile-File"], os.path.basename(path))
+        self.assertIn("s ", response["X-Profile-Summary"])
+
+        with open(path.replace(".pstats", ".txt")) as file:
+            summary = file.read()
+
+        self.assertTrue(summary.startswith("GET /cryptos\n"))
+        self.assertIn("cumulative", summary)
+
+    def test_request_without_header_is_not_profiled(self):
+        response = self.client.get(reverse("cryptos"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Summary", response)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_non_staff_user_cannot_profile_request(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(reverse("cryptos"), HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Summary", response)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_sampled_request_is_profiled_without_summary_header(self):
+        with override_settings(
+            PROFILING={**self.settings.options["PROFILING"], "SAMPLE_RATE": 1}
+        ):
+            response = self.client.post(
+                reverse("login"),
+                {"username": "test", "password": "Test1234"},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Summary", response)
+        self.assertIn("login_user", self._profiled_functions("login"))
+
+    def test_disabled_profiling_ignores_header(self):
+        # The middleware is loaded with the first request of a client
+        client = Client()
+        client.force_login(self.user)
+
+        with override_settings(
+            PROFILING={**self.settings.options["PROFILING"], "ENABLED": False}
+        ):
+            response = client.get(reverse("cryptos"), HTTP_X_PROFILE="1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    async def test_async_view_is_profiled_on_event_loop_and_in_sync_thread(self):
+        response = await self.async_client.get(
+            reverse("cryptos"), headers={"X-Profile": "1"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        functions = self._profiled_functions("cryptos")
+        # Run on the event loop
+        self.assertIn("aall", functions)
+        # Session lookup run in the thread of sync code
+        self.assertIn("_authenticate", functions)
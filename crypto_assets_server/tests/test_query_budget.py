@@ -0,0 +1,85 @@
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from auth import views as auth_views
+from cryptos.models import Crypto
+from cryptos.views import CryptoListView
+from crypto_assets_server.query_budget import QueryBudgetExceeded
+
+
+class QueryBudgetTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def test_every_view_declares_query_budget(self):
+        for pattern in get_resolver().url_patterns:
+            if isinstance(pattern, URLResolver) and pattern.app_name == "admin":
+                continue
+
+            patterns = (
+                pattern.url_patterns if isinstance(pattern, URLResolver) else [pattern]
+            )
+            for view_pattern in patterns:
+                view = getattr(
+                    view_pattern.callback, "view_class", view_pattern.callback
+                )
+
+                with self.subTest(view=view_pattern.name):
+                    self.assertIsNotNone(getattr(view, "query_budget", None))
+
+    def test_view_within_budget_passes(self):
+        response = self.client.get(reverse("cryptos"))
+
+        self.assertEqual(response.status_code, 200)
+
+    @patch.object(CryptoListView, "query_budget", 1)
+    def test_exceeded_budget_of_class_based_view_raises(self):
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "View cryptos ran 3 queries, its budget is 1"
+        ):
+            self.client.get(reverse("cryptos"))
+
+    @patch.object(CryptoListView, "query_budget", {"GET": 1})
+    def test_budget_per_method(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("cryptos"))
+
+        # Methods without a budget are not checked
+        response = self.client.post(reverse("cryptos"))
+
+        self.assertEqual(response.status_code, 405)
+
+    @patch.object(auth_views.login_user, "query_budget", 1)
+    def test_exceeded_budget_of_function_view_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.post(
+                reverse("login"),
+                {"username": "test", "password": "Test1234"},
+                content_type="application/json",
+            )
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    @patch.object(CryptoListView, "query_budget", 1)
+    def test_exceeded_budget_logs_warning_if_not_strict(self):
+        with self.assertLogs("crypto_assets_server.query_budget", "WARNING") as logs:
+            response = self.client.get(reverse("cryptos"))
+
+        self.assertEqual(response.status_code, 200)
+
+        (record,) = logs.records
+        self.assertEqual(record.view, "cryptos")
+        self.assertEqual(record.queries, 3)
+        self.assertEqual(record.query_budget, 1)
@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from .views import MetricsView
+
 urlpatterns = [
     path("", include("auth.urls")),
     path("", include("cryptos.urls")),
     path("", include("assets.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("admin/", admin.site.urls),
 ]
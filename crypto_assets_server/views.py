@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from django.views import View
+
+from .metrics import get_registry, render_prometheus
+from .mixins import CustomLoginRequiredMixin, StaffRequiredMixin
+
+
+class MetricsView(CustomLoginRequiredMixin, StaffRequiredMixin, View):
+    query_budget = 2
+
+    def get(self, *args, **kwargs):
+        registry = get_registry()
+
+        return HttpResponse(
+            render_prometheus(registry.collect(), registry.buckets),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Crypto
+from .models import Crypto, PriceSnapshot
 
 admin.site.register(Crypto)
+admin.site.register(PriceSnapshot)
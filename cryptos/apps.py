@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CryptosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cryptos'
+
+    def ready(self):
+        # Connects the signal handlers that keep the crypto registry up to date
+        from . import registry  # noqa: F401
@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .providers import PriceFetchError, PriceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(PriceFetchError):
+    def __init__(self, retry_after):
+        super().__init__("Circuit breaker for the upstream price API is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Guards calls to the upstream price API. The breaker opens when the share of failed
+    or slow calls among the last `window_size` calls exceeds its threshold. Only
+    timeouts, connection errors and 5xx responses are failures; a 4xx response, e.g.
+    for a symbol without a EUR pair, says nothing about the upstream API. While it is
+    open, calls fail immediately with CircuitOpenError. After `open_duration` seconds,
+    up to `half_open_probes` calls are let through; the breaker closes again if they
+    succeed and reopens if they fail.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_size=20,
+        min_calls=5,
+        error_rate_threshold=0.5,
+        slow_call_duration=1.0,
+        slow_call_rate_threshold=0.5,
+        open_duration=30,
+        half_open_probes=1,
+    ):
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+
+        self._calls = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.reset()
+
+    def call(self, func, *args, **kwargs):
+        generation = self._acquire()
+
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as err:
+            self._record(
+                generation,
+                failed=_is_upstream_failure(err),
+                duration=time.monotonic() - started,
+            )
+            raise
+
+        self._record(generation, failed=False, duration=time.monotonic() - started)
+
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.opened_at = None
+            self._calls.clear()
+            self._probes = 0
+            self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": len(self._calls),
+                "error_rate": self._rate(lambda call: call[0]),
+                "slow_call_rate": self._rate(lambda call: call[1]),
+                "retry_after": self._retry_after() if self.state == self.OPEN else 0,
+            }
+
+    def _acquire(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                retry_after = self._retry_after()
+                if retry_after > 0:
+                    raise CircuitOpenError(retry_after)
+
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    raise CircuitOpenError(self.open_duration)
+
+                self._probes += 1
+
+            return self._generation
+
+    def _record(self, generation, failed, duration):
+        slow = duration >= self.slow_call_duration
+
+        with self._lock:
+            # The call was admitted before the last state change, e.g. a slow call of
+            # the closed breaker finishing while probes are in flight
+            if generation != self._generation:
+                return
+
+            if self.state == self.HALF_OPEN:
+                self._transition(self.OPEN if failed or slow else self.CLOSED)
+                return
+
+            self._calls.append((failed, slow))
+
+            if len(self._calls) < self.min_calls:
+                return
+
+            error_rate = self._rate(lambda call: call[0])
+            slow_call_rate = self._rate(lambda call: call[1])
+
+            if (
+                error_rate >= self.error_rate_threshold
+                or slow_call_rate >= self.slow_call_rate_threshold
+            ):
+                logger.warning(
+                    "Upstream price API error rate %.2f, slow call rate %.2f",
+                    error_rate,
+                    slow_call_rate,
+                )
+                self._transition(self.OPEN)
+
+    def _transition(self, state):
+        if state == self.state:
+            return
+
+        logger.warning("Price circuit breaker changed from %s to %s", self.state, state)
+
+        self.state = state
+        self._calls.clear()
+        self._probes = 0
+        self._generation += 1
+
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+
+    def _retry_after(self):
+        return max(0, self.opened_at + self.open_duration - time.monotonic())
+
+    def _rate(self, predicate):
+        if not self._calls:
+            return 0
+
+        return sum(1 for call in self._calls if predicate(call)) / len(self._calls)
+
+
+def _is_upstream_failure(err):
+    if isinstance(err, PriceUnavailableError):
+        return err.status_code is not None and err.status_code >= 500
+
+    return isinstance(err, PriceFetchError)
+
+
+_breaker = None
+_breaker_pid = None
+
+
+def get_breaker():
+    """
+    Returns the circuit breaker of this process configured in
+    settings.PRICE_CIRCUIT_BREAKER.
+    """
+    global _breaker, _breaker_pid
+
+    if _breaker is None or _breaker_pid != os.getpid():
+        _breaker = CircuitBreaker(**settings.PRICE_CIRCUIT_BREAKER)
+        _breaker_pid = os.getpid()
+
+    return _breaker
+
+
+@receiver(setting_changed)
+def _reset_breaker(*, setting, **kwargs):
+    global _breaker
+
+    if setting == "PRICE_CIRCUIT_BREAKER":
+        _breaker = None
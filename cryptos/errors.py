@@ -0,0 +1,35 @@
+import math
+
+from django.http import JsonResponse
+
+from .breaker import CircuitOpenError
+from .providers import PriceTimeoutError, PriceUnavailableError
+
+
+class PriceErrorResponse(JsonResponse):
+    def __init__(self, err, subject):
+        if isinstance(err, CircuitOpenError):
+            super().__init__(
+                {"error": f"Upstream price API is unavailable, cannot fetch {subject}"},
+                status=503,
+            )
+            self["Retry-After"] = math.ceil(err.retry_after)
+        elif isinstance(err, PriceTimeoutError):
+            super().__init__(
+                {"error": f"Timeout occurred while fetching {subject}"}, status=504
+            )
+        elif isinstance(err, PriceUnavailableError):
+            super().__init__({"error": f"Could not determine {subject}"}, status=500)
+        else:
+            super().__init__(
+                {"error": f"An error occurred while fetching {subject}: {str(err)}"},
+                status=500,
+            )
+
+
+class NoPriceSnapshotErrorResponse(JsonResponse):
+    def __init__(self, crypto_names):
+        super().__init__(
+            {"error": f"No price available yet for {', '.join(crypto_names)}"},
+            status=503,
+        )
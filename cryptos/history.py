@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone as django_timezone
+
+from .models import PriceCandle, PriceRollupCursor, PriceTick
+from .prices import PRICE_UNIT
+
+CANDLE_INTERVALS = {
+    PriceCandle.INTERVAL_MINUTE: timedelta(minutes=1),
+    PriceCandle.INTERVAL_HOUR: timedelta(hours=1),
+    PriceCandle.INTERVAL_DAY: timedelta(days=1),
+}
+
+# Number of ticks rolled up in one transaction
+ROLLUP_BATCH_SIZE = 5000
+
+
+def bucket_start(moment, interval):
+    seconds = int(CANDLE_INTERVALS[interval].total_seconds())
+    timestamp = int(moment.timestamp())
+
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=timezone.utc)
+
+
+def roll_up_price_ticks(batch_size=ROLLUP_BATCH_SIZE):
+    """
+    Rolls up all price ticks recorded since the last run into 1-minute, 1-hour and
+    1-day candles and returns the number of processed ticks. Only ticks after the
+    rollup cursor are read, and only the candles they fall into are written. Ticks are
+    expected to be recorded in chronological order.
+    """
+    processed = 0
+
+    while True:
+        count = _roll_up_batch(batch_size)
+        processed += count
+
+        if count < batch_size:
+            return processed
+
+
+def prune_price_history(now=None):
+    """
+    Deletes rolled up ticks and candles older than their PRICE_HISTORY_RETENTION.
+    Returns the number of deleted rows.
+    """
+    now = now or django_timezone.now()
+    retention = settings.PRICE_HISTORY_RETENTION
+    deleted = 0
+
+    if retention.get("tick") is not None:
+        cursor = PriceRollupCursor.objects.first()
+        last_tick_id = cursor.last_tick_id if cursor is not None else 0
+
+        deleted += PriceTick.objects.filter(
+            id__lte=last_tick_id,
+            recorded_at__lt=now - timedelta(seconds=retention["tick"]),
+        ).delete()[0]
+
+    for interval in CANDLE_INTERVALS:
+        if retention.get(interval) is None:
+            continue
+
+        deleted += PriceCandle.objects.filter(
+            interval=interval,
+            bucket_start__lt=now - timedelta(seconds=retention[interval]),
+        ).delete()[0]
+
+    return deleted
+
+
+def candle_data(bucket_start, open, high, low, close):
+    return {
+        "start": bucket_start.isoformat(),
+        "open": str(open),
+        "high": str(high),
+        "low": str(low),
+        "close": str(close),
+    }
+
+
+def history_data(crypto_name, interval, candles):
+    return {
+        "crypto_name": crypto_name,
+        "interval": interval,
+        "unit": PRICE_UNIT,
+        "candles": [candle_data(*candle) for candle in candles],
+    }
+
+
+@transaction.atomic
+def _roll_up_batch(batch_size):
+    cursor, _ = PriceRollupCursor.objects.select_for_update().get_or_create(id=1)
+
+    ticks = list(
+        PriceTick.objects.filter(id__gt=cursor.last_tick_id)
+        .order_by("id")
+        .values_list("id", "crypto_id", "price", "recorded_at")[:batch_size]
+    )
+    if not ticks:
+        return 0
+
+    # (crypto_id, interval, bucket_start) -> [open, high, low, close]
+    candles = {}
+    for _, crypto_id, price, recorded_at in ticks:
+        for interval in CANDLE_INTERVALS:
+            key = (crypto_id, interval, bucket_start(recorded_at, interval))
+
+            candle = candles.get(key)
+            if candle is None:
+                candles[key] = [price, price, price, price]
+            else:
+                candle[1] = max(candle[1], price)
+                candle[2] = min(candle[2], price)
+                candle[3] = price
+
+    _merge_existing_candles(candles)
+
+    PriceCandle.objects.bulk_create(
+        [
+            PriceCandle(
+                crypto_id=crypto_id,
+                interval=interval,
+                bucket_start=start,
+                open=open,
+                high=high,
+                low=low,
+                close=close,
+            )
+            for (crypto_id, interval, start), (
+                open,
+                high,
+                low,
+                close,
+            ) in candles.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["crypto", "interval", "bucket_start"],
+        update_fields=["open", "high", "low", "close"],
+    )
+
+    cursor.last_tick_id = ticks[-1][0]
+    cursor.save(update_fields=["last_tick_id"])
+
+    return len(ticks)
+
+
+def _merge_existing_candles(candles):
+    """
+    Merges candles written by earlier runs for the same buckets into `candles`. They
+    cover earlier ticks, so they keep their open price.
+    """
+    for interval in CANDLE_INTERVALS:
+        keys = [key for key in candles if key[1] == interval]
+
+        existing = PriceCandle.objects.filter(
+            interval=interval,
+            crypto_id__in={crypto_id for crypto_id, _, _ in keys},
+            bucket_start__in={start for _, _, start in keys},
+        ).values_list("crypto_id", "bucket_start", "open", "high", "low")
+
+        for crypto_id, start, open, high, low in existing:
+            candle = candles.get((crypto_id, interval, start))
+            if candle is None:
+                continue
+
+            candle[0] = open
+            candle[1] = max(candle[1], high)
+            candle[2] = min(candle[2], low)
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cryptos.providers import PriceFetchError
+from cryptos.snapshots import refresh_price_snapshots
+
+
+class Command(BaseCommand):
+    help = "Periodically fetches the prices of all cryptos and stores them as snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PRICE_POLL_INTERVAL,
+            help="Seconds between two polls",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Poll only once and exit"
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        while True:
+            started = time.monotonic()
+
+            try:
+                count = refresh_price_snapshots()
+            except PriceFetchError as err:
+                self.stderr.write(f"Could not fetch prices: {err}")
+            else:
+                self.stdout.write(f"Updated {count} price snapshots")
+
+            if options["once"]:
+                break
+
+            time.sleep(max(0, interval - (time.monotonic() - started)))
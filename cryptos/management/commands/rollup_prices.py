@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from cryptos.history import prune_price_history, roll_up_price_ticks
+
+
+class Command(BaseCommand):
+    help = (
+        "Rolls up new price ticks into 1-minute, 1-hour and 1-day candles and prunes "
+        "ticks and candles past their retention"
+    )
+
+    def handle(self, *args, **options):
+        count = roll_up_price_ticks()
+        self.stdout.write(f"Rolled up {count} price ticks")
+
+        count = prune_price_history()
+        self.stdout.write(f"Pruned {count} price ticks and candles")
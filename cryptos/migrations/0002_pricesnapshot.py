@@ -0,0 +1,23 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cryptos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=8, max_digits=24)),
+                ('fetched_at', models.DateTimeField()),
+                ('crypto', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='price_snapshot', to='cryptos.crypto')),
+            ],
+        ),
+    ]
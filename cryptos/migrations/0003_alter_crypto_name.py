@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryptos", "0002_pricesnapshot"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="crypto",
+            name="name",
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryptos", "0003_alter_crypto_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceRollupCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_tick_id", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PriceTick",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("price", models.DecimalField(decimal_places=8, max_digits=24)),
+                ("recorded_at", models.DateTimeField(db_index=True)),
+                (
+                    "crypto",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_ticks",
+                        to="cryptos.crypto",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PriceCandle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "interval",
+                    models.CharField(
+                        choices=[("1m", "1 minute"), ("1h", "1 hour"), ("1d", "1 day")],
+                        max_length=2,
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("open", models.DecimalField(decimal_places=8, max_digits=24)),
+                ("high", models.DecimalField(decimal_places=8, max_digits=24)),
+                ("low", models.DecimalField(decimal_places=8, max_digits=24)),
+                ("close", models.DecimalField(decimal_places=8, max_digits=24)),
+                (
+                    "crypto",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_candles",
+                        to="cryptos.crypto",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="pricecandle",
+            constraint=models.UniqueConstraint(
+                fields=("crypto", "interval", "bucket_start"),
+                name="unique_price_candle",
+            ),
+        ),
+    ]
@@ -2,6 +2,57 @@ from django.db import models
 
 
 class Crypto(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
     abbreviation = models.CharField(max_length=10)
     iconurl = models.CharField(max_length=255)
+
+
+class PriceSnapshot(models.Model):
+    crypto = models.OneToOneField(
+        Crypto, on_delete=models.CASCADE, related_name="price_snapshot"
+    )
+    price = models.DecimalField(max_digits=24, decimal_places=8)
+    fetched_at = models.DateTimeField()
+
+
+class PriceTick(models.Model):
+    crypto = models.ForeignKey(
+        Crypto, on_delete=models.CASCADE, related_name="price_ticks"
+    )
+    price = models.DecimalField(max_digits=24, decimal_places=8)
+    recorded_at = models.DateTimeField(db_index=True)
+
+
+class PriceCandle(models.Model):
+    INTERVAL_MINUTE = "1m"
+    INTERVAL_HOUR = "1h"
+    INTERVAL_DAY = "1d"
+    INTERVAL_CHOICES = [
+        (INTERVAL_MINUTE, "1 minute"),
+        (INTERVAL_HOUR, "1 hour"),
+        (INTERVAL_DAY, "1 day"),
+    ]
+
+    crypto = models.ForeignKey(
+        Crypto, on_delete=models.CASCADE, related_name="price_candles"
+    )
+    interval = models.CharField(max_length=2, choices=INTERVAL_CHOICES)
+    bucket_start = models.DateTimeField()
+    open = models.DecimalField(max_digits=24, decimal_places=8)
+    high = models.DecimalField(max_digits=24, decimal_places=8)
+    low = models.DecimalField(max_digits=24, decimal_places=8)
+    close = models.DecimalField(max_digits=24, decimal_places=8)
+
+    class Meta:
+        # Also serves the history queries, which filter on all three columns
+        constraints = [
+            models.UniqueConstraint(
+                fields=["crypto", "interval", "bucket_start"],
+                name="unique_price_candle",
+            )
+        ]
+
+
+class PriceRollupCursor(models.Model):
+    # Id of the last price tick that was rolled up into candles
+    last_tick_id = models.BigIntegerField(default=0)
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from crypto_assets_server.counters import CacheCounters
+from .breaker import get_breaker
+from .providers import (
+    PriceFetchError,
+    PriceTimeoutError,
+    PriceUnavailableError,
+    get_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+PRICE_UNIT = "EUR"
+
+PRICE_CACHE_KEY_PREFIX = "prices"
+
+# Interval in which requests waiting for an in-flight fetch check the cache again
+WAIT_POLL_INTERVAL = 0.02
+
+_stats = CacheCounters(
+    PRICE_CACHE_KEY_PREFIX, ("hits", "stale_hits", "misses", "coalesced", "fallbacks")
+)
+
+# A price together with the time (seconds since the epoch) it was fetched upstream
+Price = namedtuple("Price", ["value", "fetched_at", "stale"])
+
+
+def price_symbol(abbreviation):
+    return abbreviation + PRICE_UNIT
+
+
+def price_data(crypto_name, price):
+    return {
+        "crypto_name": crypto_name,
+        "price": price.value,
+        "unit": PRICE_UNIT,
+        "stale": price.stale,
+        "as_of": datetime.fromtimestamp(price.fetched_at, tz=timezone.utc).isoformat(),
+    }
+
+
+def get_price(symbol):
+    """
+    Returns the Price of the given symbol. Prices younger than PRICE_CACHE_TTL are
+    served from the cache. Older prices within PRICE_STALE_WHILE_REVALIDATE are served
+    as stale while they are refreshed in the background. All other prices are fetched
+    upstream, where concurrent misses for the same symbol are coalesced across all
+    workers sharing the cache. If that fetch fails, a price not older than
+    PRICE_MAX_STALENESS is served as stale.
+    """
+    entry = cache.get(_price_key(symbol))
+    age = _age(entry)
+
+    if age <= settings.PRICE_CACHE_TTL:
+        _stats.increment("hits")
+        return Price(*entry, stale=False)
+
+    if age <= settings.PRICE_CACHE_TTL + settings.PRICE_STALE_WHILE_REVALIDATE:
+        _stats.increment("stale_hits")
+        revalidate_in_background([symbol])
+        return Price(*entry, stale=True)
+
+    try:
+        return _fetch_coalesced(symbol)
+    except PriceFetchError:
+        if age > settings.PRICE_MAX_STALENESS:
+            raise
+
+        _stats.increment("fallbacks")
+        return Price(*entry, stale=True)
+
+
+async def aget_price(symbol):
+    """
+    Async version of get_price(). Waiting for the in-flight fetch of another request
+    happens on the event loop, so only the upstream fetch itself takes up a thread.
+    """
+    entry = await cache.aget(_price_key(symbol))
+    age = _age(entry)
+
+    if age <= settings.PRICE_CACHE_TTL:
+        await _stats.aincrement("hits")
+        return Price(*entry, stale=False)
+
+    if age <= settings.PRICE_CACHE_TTL + settings.PRICE_STALE_WHILE_REVALIDATE:
+        await _stats.aincrement("stale_hits")
+        await sync_to_async(revalidate_in_background, thread_sensitive=False)([symbol])
+        return Price(*entry, stale=True)
+
+    try:
+        return await _afetch_coalesced(symbol)
+    except PriceFetchError:
+        if age > settings.PRICE_MAX_STALENESS:
+            raise
+
+        await _stats.aincrement("fallbacks")
+        return Price(*entry, stale=True)
+
+
+def get_prices(symbols):
+    """
+    Returns a dict mapping each of the given symbols to its Price, following the same
+    freshness rules as get_price(). Cached prices are looked up in one cache round
+    trip, all others are fetched in one upstream request.
+    """
+    keys = {_price_key(symbol): symbol for symbol in symbols}
+    entries = {keys[key]: entry for key, entry in cache.get_many(keys).items()}
+
+    prices = {}
+    stale = []
+    missing = []
+
+    for symbol in keys.values():
+        entry = entries.get(symbol)
+        age = _age(entry)
+
+        if age <= settings.PRICE_CACHE_TTL:
+            prices[symbol] = Price(*entry, stale=False)
+        elif age <= settings.PRICE_CACHE_TTL + settings.PRICE_STALE_WHILE_REVALIDATE:
+            prices[symbol] = Price(*entry, stale=True)
+            stale.append(symbol)
+        else:
+            missing.append(symbol)
+
+    _stats.increment("hits", len(prices) - len(stale))
+    _stats.increment("stale_hits", len(stale))
+
+    if stale:
+        revalidate_in_background(stale)
+
+    if missing:
+        _stats.increment("misses", len(missing))
+
+        try:
+            fetched = _fetch_many(missing)
+        except PriceFetchError:
+            fallbacks = {
+                symbol: Price(*entries[symbol], stale=True)
+                for symbol in missing
+                if _age(entries.get(symbol)) <= settings.PRICE_MAX_STALENESS
+            }
+            if len(fallbacks) < len(missing):
+                raise
+
+            _stats.increment("fallbacks", len(fallbacks))
+            fetched = fallbacks
+
+        prices.update(fetched)
+
+    return prices
+
+
+def revalidate_in_background(symbols):
+    """
+    Refreshes the prices of the given symbols in a background thread. Symbols whose
+    price is already being fetched by another request are skipped.
+    """
+    symbols = [symbol for symbol in symbols if _acquire_fetch_lock(symbol)]
+    if symbols:
+        threading.Thread(target=_revalidate, args=(symbols,), daemon=True).start()
+
+
+def get_price_cache_stats():
+    return _stats.values()
+
+
+def _fetch_coalesced(symbol):
+    key = _price_key(symbol)
+    deadline = time.monotonic() + settings.PRICE_FETCH_TIMEOUT
+
+    while True:
+        if _acquire_fetch_lock(symbol):
+            _stats.increment("misses")
+
+            try:
+                return _fetch_one(symbol)
+            finally:
+                cache.delete(_lock_key(symbol))
+
+        if time.monotonic() > deadline:
+            raise PriceTimeoutError(
+                f"Timed out waiting for in-flight fetch of {symbol}"
+            )
+
+        time.sleep(WAIT_POLL_INTERVAL)
+
+        entry = cache.get(key)
+        if _age(entry) <= settings.PRICE_CACHE_TTL:
+            _stats.increment("coalesced")
+            return Price(*entry, stale=False)
+
+
+async def _afetch_coalesced(symbol):
+    key = _price_key(symbol)
+    deadline = time.monotonic() + settings.PRICE_FETCH_TIMEOUT
+
+    while True:
+        if await cache.aadd(
+            _lock_key(symbol), 1, timeout=settings.PRICE_FETCH_TIMEOUT + 1
+        ):
+            await _stats.aincrement("misses")
+
+            try:
+                return await sync_to_async(_fetch_one, thread_sensitive=False)(symbol)
+            finally:
+                await cache.adelete(_lock_key(symbol))
+
+        if time.monotonic() > deadline:
+            raise PriceTimeoutError(
+                f"Timed out waiting for in-flight fetch of {symbol}"
+            )
+
+        await asyncio.sleep(WAIT_POLL_INTERVAL)
+
+        entry = await cache.aget(key)
+        if _age(entry) <= settings.PRICE_CACHE_TTL:
+            await _stats.aincrement("coalesced")
+            return Price(*entry, stale=False)
+
+
+def _fetch_one(symbol):
+    value = get_breaker().call(get_provider().fetch_price, symbol)
+
+    return _store({symbol: value}, [symbol])[symbol]
+
+
+def _fetch_many(symbols):
+    values = get_breaker().call(get_provider().fetch_prices, symbols)
+
+    return _store(values, symbols)
+
+
+def _store(values, symbols):
+    not_found = [symbol for symbol in symbols if symbol not in values]
+    if not_found:
+        raise PriceUnavailableError(f"No price for {', '.join(not_found)}")
+
+    fetched_at = time.time()
+    timeout = max(
+        settings.PRICE_CACHE_TTL + settings.PRICE_STALE_WHILE_REVALIDATE,
+        settings.PRICE_MAX_STALENESS,
+    )
+
+    cache.set_many(
+        {_price_key(symbol): (values[symbol], fetched_at) for symbol in symbols},
+        timeout=timeout,
+    )
+
+    return {
+        symbol: Price(values[symbol], fetched_at, stale=False) for symbol in symbols
+    }
+
+
+def _revalidate(symbols):
+    try:
+        _fetch_many(symbols)
+    except PriceFetchError as err:
+        logger.warning("Could not revalidate prices of %s: %s", symbols, err)
+    finally:
+        cache.delete_many([_lock_key(symbol) for symbol in symbols])
+
+
+def _acquire_fetch_lock(symbol):
+    return cache.add(_lock_key(symbol), 1, timeout=settings.PRICE_FETCH_TIMEOUT + 1)
+
+
+def _age(entry):
+    if entry is None:
+        return float("inf")
+
+    return time.time() - entry[1]
+
+
+def _price_key(symbol):
+    return f"{PRICE_CACHE_KEY_PREFIX}:{symbol}"
+
+
+def _lock_key(symbol):
+    return f"{PRICE_CACHE_KEY_PREFIX}:{symbol}:lock"
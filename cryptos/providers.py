@@ -0,0 +1,145 @@
+import json
+import os
+import time
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+from crypto_assets_server.metrics import record_upstream_call
+
+
+class PriceFetchError(Exception):
+    pass
+
+
+class PriceTimeoutError(PriceFetchError):
+    pass
+
+
+class PriceUnavailableError(PriceFetchError):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PriceProvider:
+    def fetch_price(self, symbol):
+        return self.fetch_prices([symbol])[symbol]
+
+    def fetch_prices(self, symbols):
+        """
+        Returns a dict mapping the given symbols to their prices. Symbols for which no
+        price is known are missing from the result.
+        """
+        raise NotImplementedError
+
+
+class BinancePriceProvider(PriceProvider):
+    """
+    Fetches prices from the Binance ticker endpoint. All requests of a process share
+    one session, so connections to Binance are kept alive and reused.
+    """
+
+    def __init__(
+        self,
+        base_url="https://api.binance.com",
+        pool_size=10,
+        connect_timeout=2,
+        read_timeout=3,
+    ):
+        self.ticker_url = f"{base_url}/api/v3/ticker/price"
+        self.timeout = (connect_timeout, read_timeout)
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch_price(self, symbol):
+        return self._request_ticker({"symbol": symbol})["price"]
+
+    def fetch_prices(self, symbols):
+        # The multi-symbol form of the ticker endpoint returns all prices at once
+        symbols_param = json.dumps(list(symbols), separators=(",", ":"))
+        tickers = self._request_ticker({"symbols": symbols_param})
+
+        return {ticker["symbol"]: ticker["price"] for ticker in tickers}
+
+    def _request_ticker(self, params):
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                self.ticker_url, params=params, timeout=self.timeout
+            )
+        except requests.Timeout as err:
+            raise PriceTimeoutError(str(err)) from err
+        except requests.RequestException as err:
+            raise PriceFetchError(str(err)) from err
+        finally:
+            record_upstream_call(time.perf_counter() - started)
+
+        if response.status_code != 200:
+            raise PriceUnavailableError(
+                f"Upstream responded with {response.status_code}",
+                status_code=response.status_code,
+            )
+
+        return response.json()
+
+
+class StubPriceProvider(PriceProvider):
+    """
+    Serves prices from a dict or a JSON file mapping symbols to prices, e.g. for load
+    tests without network access.
+    """
+
+    def __init__(self, prices=None, path=None):
+        self.prices = dict(prices or {})
+
+        if path is not None:
+            with open(path, encoding="utf-8") as file:
+                self.prices.update(json.load(file))
+
+    def fetch_price(self, symbol):
+        try:
+            return self.prices[symbol]
+        except KeyError:
+            raise PriceUnavailableError(f"No price for {symbol}") from None
+
+    def fetch_prices(self, symbols):
+        return {
+            symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices
+        }
+
+
+_provider = None
+_provider_pid = None
+
+
+def get_provider():
+    """
+    Returns the price provider configured in settings.PRICE_PROVIDER. The provider is
+    created once per process, so forked workers never share a connection pool.
+    """
+    global _provider, _provider_pid
+
+    if _provider is None or _provider_pid != os.getpid():
+        config = settings.PRICE_PROVIDER
+        provider_class = import_string(config["BACKEND"])
+
+        _provider = provider_class(**config.get("OPTIONS", {}))
+        _provider_pid = os.getpid()
+
+    return _provider
+
+
+@receiver(setting_changed)
+def _reset_provider(*, setting, **kwargs):
+    global _provider
+
+    if setting == "PRICE_PROVIDER":
+        _provider = None
@@ -0,0 +1,143 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Crypto
+
+CATALOG_VERSION_KEY = "cryptos:catalog_version"
+
+
+class CryptoRegistry:
+    """
+    In-memory copy of the crypto catalog, loaded once per process. Changes to a Crypto
+    replace the catalog version stamp in the cache, which makes every process sharing
+    the cache reload its copy on the next lookup. Processes not sharing the cache, e.g.
+    with the local memory cache, reload their copy after CRYPTO_REGISTRY_MAX_AGE
+    seconds, and replace the stamp if the catalog changed in the meantime.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._loaded_at = 0
+        self._cryptos = []
+        self._by_name = {}
+        self._by_abbreviation = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        self._ensure_loaded()
+
+        return self._by_name.get(name)
+
+    def get_by_abbreviation(self, abbreviation):
+        self._ensure_loaded()
+
+        return self._by_abbreviation.get(abbreviation)
+
+    def all(self):
+        self._ensure_loaded()
+
+        return self._cryptos
+
+    async def aget(self, name):
+        await self._aensure_loaded()
+
+        return self._by_name.get(name)
+
+    async def aall(self):
+        await self._aensure_loaded()
+
+        return self._cryptos
+
+    async def aversion(self):
+        await self._aensure_loaded()
+
+        return self._version
+
+    def invalidate(self):
+        self._version = None
+        cache.set(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    def _ensure_loaded(self):
+        version = cache.get(CATALOG_VERSION_KEY)
+        if version is None:
+            cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(CATALOG_VERSION_KEY)
+
+        if self._is_current(version):
+            return
+
+        with self._lock:
+            if self._is_current(version):
+                return
+
+            cryptos = list(Crypto.objects.order_by("id"))
+            if self._changed_unseen(cryptos, version):
+                version = uuid.uuid4().hex
+                cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+
+            self._load(cryptos, version)
+
+    async def _aensure_loaded(self):
+        version = await cache.aget(CATALOG_VERSION_KEY)
+        if version is None:
+            await cache.aadd(CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = await cache.aget(CATALOG_VERSION_KEY)
+
+        if self._is_current(version):
+            return
+
+        # Concurrent loads cannot be serialized with the thread lock without blocking
+        # the event loop, but loading the same version twice is harmless
+        cryptos = [crypto async for crypto in Crypto.objects.order_by("id")]
+        if self._changed_unseen(cryptos, version):
+            version = uuid.uuid4().hex
+            await cache.aset(CATALOG_VERSION_KEY, version, timeout=None)
+
+        self._load(cryptos, version)
+
+    def _is_current(self, version):
+        return (
+            version == self._version
+            and time.monotonic() - self._loaded_at < settings.CRYPTO_REGISTRY_MAX_AGE
+        )
+
+    def _changed_unseen(self, cryptos, version):
+        # A change by a process that does not share the cache leaves the stamp, and the
+        # ETags derived from it, as they were
+        return version == self._version and _catalog_key(cryptos) != _catalog_key(
+            self._cryptos
+        )
+
+    def _load(self, cryptos, version):
+        self._loaded_at = time.monotonic()
+        self._cryptos = cryptos
+        self._by_name = {crypto.name: crypto for crypto in cryptos}
+        self._by_abbreviation = {crypto.abbreviation: crypto for crypto in cryptos}
+        self._version = version
+
+
+def _catalog_key(cryptos):
+    return [
+        tuple(field.value_from_object(crypto) for field in Crypto._meta.concrete_fields)
+        for crypto in cryptos
+    ]
+
+
+crypto_registry = CryptoRegistry()
+
+
+@receiver(post_save, sender=Crypto)
+@receiver(post_delete, sender=Crypto)
+def _invalidate_registry(**kwargs):
+    crypto_registry.invalidate()
+
+    # Other processes may reload before the change is committed, so invalidate again
+    # once it is visible to them
+    transaction.on_commit(crypto_registry.invalidate)
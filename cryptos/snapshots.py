@@ -0,0 +1,49 @@
+from django.utils import timezone
+
+from .models import Crypto, PriceSnapshot, PriceTick
+from .prices import PRICE_UNIT, price_symbol
+from .providers import get_provider
+
+
+def refresh_price_snapshots():
+    """
+    Fetches the prices of all cryptos with one upstream request, upserts them into the
+    price snapshots and records them as price ticks for the price history. Returns the
+    number of updated snapshots.
+    """
+    cryptos = list(Crypto.objects.only("id", "abbreviation"))
+    if not cryptos:
+        return 0
+
+    symbols = [price_symbol(crypto.abbreviation) for crypto in cryptos]
+    prices = get_provider().fetch_prices(symbols)
+    fetched_at = timezone.now()
+
+    snapshots = [
+        PriceSnapshot(crypto=crypto, price=prices[symbol], fetched_at=fetched_at)
+        for crypto, symbol in zip(cryptos, symbols)
+        if symbol in prices
+    ]
+
+    PriceSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["crypto"],
+        update_fields=["price", "fetched_at"],
+    )
+    PriceTick.objects.bulk_create(
+        PriceTick(crypto=snapshot.crypto, price=snapshot.price, recorded_at=fetched_at)
+        for snapshot in snapshots
+    )
+
+    return len(snapshots)
+
+
+def snapshot_data(crypto_name, price, fetched_at):
+    return {
+        "crypto_name": crypto_name,
+        "price": str(price),
+        "unit": PRICE_UNIT,
+        "as_of": fetched_at.isoformat(),
+        "age": round((timezone.now() - fetched_at).total_seconds(), 3),
+    }
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import reverse
+
+from .prices import get_prices, price_data
+from .providers import PriceFetchError
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, symbols):
+        # Symbol -> crypto name
+        self.symbols = symbols
+        # (symbol, Price) of each price change
+        self.queue = asyncio.Queue(
+            maxsize=max(settings.PRICE_STREAM_QUEUE_SIZE, len(symbols))
+        )
+        self.dropped = False
+
+
+class PriceBroadcaster:
+    """
+    Polls the prices of all symbols subscribed in this process with one task and
+    pushes changed prices to the queues of the subscriptions. A subscription whose
+    queue is full is dropped instead of slowing down the others.
+    """
+
+    def __init__(self):
+        self.subscriptions = set()
+        self.latest = {}
+        self._task = None
+
+    def subscribe(self, symbols):
+        subscription = Subscription(symbols)
+
+        for symbol in symbols:
+            if symbol in self.latest:
+                subscription.queue.put_nowait((symbol, self.latest[symbol]))
+
+        self.subscriptions.add(subscription)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+
+        if not self.subscriptions and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _poll(self):
+        while self.subscriptions:
+            symbols = set().union(*(s.symbols for s in self.subscriptions))
+
+            try:
+                # Goes through the shared price cache, so it does not add upstream
+                # calls on top of the ones of the other price views
+                prices = await sync_to_async(get_prices, thread_sensitive=False)(
+                    symbols
+                )
+            except PriceFetchError as err:
+                logger.warning("Could not fetch prices to stream: %s", err)
+            else:
+                self._broadcast(prices)
+
+            await asyncio.sleep(settings.PRICE_STREAM_INTERVAL)
+
+    def _broadcast(self, prices):
+        changed = {
+            symbol: price
+            for symbol, price in prices.items()
+            if symbol not in self.latest or self.latest[symbol].value != price.value
+        }
+        self.latest.update(changed)
+
+        for subscription in list(self.subscriptions):
+            for symbol in changed.keys() & subscription.symbols.keys():
+                try:
+                    subscription.queue.put_nowait((symbol, changed[symbol]))
+                except asyncio.QueueFull:
+                    logger.info("Dropping slow price stream subscriber")
+                    subscription.dropped = True
+                    self.unsubscribe(subscription)
+                    break
+
+
+_broadcasters = {}
+
+
+def get_broadcaster():
+    """
+    Returns the broadcaster of the running event loop, which is one per process under
+    an ASGI server.
+    """
+    loop = asyncio.get_running_loop()
+
+    if loop not in _broadcasters:
+        # Broadcasters of closed loops (only in tests) cannot be used anymore
+        for closed in [other for other in _broadcasters if other.is_closed()]:
+            del _broadcasters[closed]
+
+        _broadcasters[loop] = PriceBroadcaster()
+
+    return _broadcasters[loop]
+
+
+async def price_events(symbols):
+    """
+    Yields a Server-Sent Event for every change of the price of one of the given
+    symbols (mapped to their crypto names), with a comment line as heartbeat whenever
+    PRICE_STREAM_HEARTBEAT seconds pass without change.
+    """
+    broadcaster = get_broadcaster()
+    subscription = broadcaster.subscribe(symbols)
+
+    try:
+        yield "retry: 5000\n\n"
+
+        while True:
+            try:
+                symbol, price = await asyncio.wait_for(
+                    subscription.queue.get(), settings.PRICE_STREAM_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            if subscription.dropped:
+                return
+
+            data = json.dumps(price_data(symbols[symbol], price))
+            yield f"event: price\ndata: {data}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+class StreamDisconnectMiddleware:
+    """
+    ASGI middleware that cancels a price stream once its client disconnects. Django
+    4.2 does not listen for http.disconnect while it sends a streaming response, and
+    ASGI servers silently drop what is sent after the disconnect, so the stream and
+    its subscription would otherwise live forever.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != reverse("crypto-stream"):
+            return await self.app(scope, receive, send)
+
+        body_received = asyncio.Event()
+
+        async def receive_body():
+            message = await receive()
+            if message["type"] != "http.request" or not message.get("more_body"):
+                body_received.set()
+
+            return message
+
+        async def wait_for_disconnect():
+            # Django stops receiving once it has read the body
+            await body_received.wait()
+
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        app = asyncio.ensure_future(self.app(scope, receive_body, send))
+        disconnect = asyncio.ensure_future(wait_for_disconnect())
+
+        try:
+            await asyncio.wait({app, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            disconnect.cancel()
+
+            if not app.done():
+                # Closes the event generator, which ends the subscription
+                app.cancel()
+                try:
+                    await app
+                except asyncio.CancelledError:
+                    pass
+
+        if not app.cancelled():
+            app.result()
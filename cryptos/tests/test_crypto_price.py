@@ -1,15 +1,19 @@
 from unittest.mock import patch
 import requests
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from cryptos.breaker import get_breaker
 from cryptos.models import Crypto
 
 
 class CryptoPriceTestCase(TestCase):
     def setUp(self):
         self.client = Client()
+        cache.clear()
+        get_breaker().reset()
 
         Crypto.objects.create(
             name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
@@ -25,20 +29,28 @@ class CryptoPriceTestCase(TestCase):
 
         return response
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_crypto_price(self, mock_request):
         mock_request.return_value.status_code = 200
         mock_request.return_value.json.return_value = {"price": "1000"}
 
         response = self._get_crypto_price("bitcoin")
 
-        expected_json = {"crypto_name": "bitcoin", "price": "1000", "unit": "EUR"}
+        expected_json = {
+            "crypto_name": "bitcoin",
+            "price": "1000",
+            "unit": "EUR",
+            "stale": False,
+        }
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/json")
-        self.assertDictEqual(response.json(), expected_json)
+        json_data = response.json()
+        self.assertIn("as_of", json_data)
+        json_data.pop("as_of")
+        self.assertDictEqual(json_data, expected_json)
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_crypto_price_fails_if_request_to_remote_api_fails(self, mock_request):
         mock_request.return_value.status_code = 500
 
@@ -53,7 +65,7 @@ class CryptoPriceTestCase(TestCase):
         self.assertContains(response, "error", status_code=404)
         self.assertEqual(response["Content-Type"], "application/json")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_crypto_price_fails_for_timeout(self, mock_request):
         mock_request.side_effect = requests.Timeout()
 
@@ -62,7 +74,7 @@ class CryptoPriceTestCase(TestCase):
         self.assertContains(response, "error", status_code=504)
         self.assertEqual(response["Content-Type"], "application/json")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_crypto_price_fails_for_request_exception(self, mock_request):
         mock_request.side_effect = requests.RequestException()
 
@@ -0,0 +1,161 @@
+import json
+from unittest.mock import patch
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto
+from cryptos.registry import crypto_registry
+
+
+class CryptoPricesTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=user.username, password="Test1234")
+
+    def _get_crypto_prices(self, names=None):
+        params = {} if names is None else {"names": names}
+        response = self.client.get(reverse("crypto-prices"), params)
+
+        return response
+
+    def _without_as_of(self, json_data):
+        for price in json_data["prices"]:
+            self.assertIsNotNone(price.pop("as_of", None))
+
+        return json_data
+
+    def _mock_tickers(self, mock_request, tickers):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = [
+            {"symbol": symbol, "price": price} for symbol, price in tickers.items()
+        ]
+
+    @patch("requests.Session.get")
+    def test_get_prices_of_given_cryptos(self, mock_request):
+        self._mock_tickers(mock_request, {"ETHEUR": "100", "BTCEUR": "1000"})
+
+        response = self._get_crypto_prices("ethereum,bitcoin")
+
+        expected_json = {
+            "prices": [
+                {
+                    "crypto_name": "ethereum",
+                    "price": "100",
+                    "unit": "EUR",
+                    "stale": False,
+                },
+                {
+                    "crypto_name": "bitcoin",
+                    "price": "1000",
+                    "unit": "EUR",
+                    "stale": False,
+                },
+            ]
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertDictEqual(self._without_as_of(response.json()), expected_json)
+
+        mock_request.assert_called_once()
+        params = mock_request.call_args.kwargs["params"]
+        self.assertListEqual(json.loads(params["symbols"]), ["ETHEUR", "BTCEUR"])
+
+    @patch("requests.Session.get")
+    def test_get_prices_of_all_supported_cryptos(self, mock_request):
+        self._mock_tickers(mock_request, {"BTCEUR": "1000", "ETHEUR": "100"})
+
+        crypto_registry.all()
+
+        with self.assertNumQueries(2):
+            response = self._get_crypto_prices()
+
+        expected_json = {
+            "prices": [
+                {
+                    "crypto_name": "bitcoin",
+                    "price": "1000",
+                    "unit": "EUR",
+                    "stale": False,
+                },
+                {
+                    "crypto_name": "ethereum",
+                    "price": "100",
+                    "unit": "EUR",
+                    "stale": False,
+                },
+            ]
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(self._without_as_of(response.json()), expected_json)
+        mock_request.assert_called_once()
+
+    @patch("requests.Session.get")
+    def test_only_uncached_prices_are_fetched(self, mock_request):
+        self._mock_tickers(mock_request, {"BTCEUR": "1000"})
+        self._get_crypto_prices("bitcoin")
+
+        self._mock_tickers(mock_request, {"ETHEUR": "100"})
+        response = self._get_crypto_prices("bitcoin,ethereum")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+
+        params = mock_request.call_args.kwargs["params"]
+        self.assertListEqual(json.loads(params["symbols"]), ["ETHEUR"])
+
+    def test_get_prices_fails_for_unsupported_crypto(self):
+        response = self._get_crypto_prices("bitcoin,unsupported_crypto")
+
+        self.assertContains(response, "error", status_code=404)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_get_prices_fails_for_empty_names(self):
+        response = self._get_crypto_prices("")
+
+        self.assertContains(response, "error", status_code=400)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @patch("requests.Session.get")
+    def test_get_prices_fails_if_request_to_remote_api_fails(self, mock_request):
+        mock_request.return_value.status_code = 500
+
+        response = self._get_crypto_prices("bitcoin,ethereum")
+
+        self.assertContains(response, "error", status_code=500)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @patch("requests.Session.get")
+    def test_get_prices_fails_for_timeout(self, mock_request):
+        mock_request.side_effect = requests.Timeout()
+
+        response = self._get_crypto_prices("bitcoin,ethereum")
+
+        self.assertContains(response, "error", status_code=504)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_user_must_be_logged_in_to_get_prices(self):
+        self.client.logout()
+
+        response = self._get_crypto_prices("bitcoin")
+
+        self.assertContains(response, "error", status_code=401)
+        self.assertEqual(response["Content-Type"], "application/json")
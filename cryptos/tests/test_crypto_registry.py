@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.models import Crypto
+from cryptos.registry import CATALOG_VERSION_KEY, CryptoRegistry, crypto_registry
+
+
+class CryptoRegistryTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+    def test_lookups_do_not_query_database_once_loaded(self):
+        crypto_registry.all()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(crypto_registry.get("bitcoin"), self.bitcoin)
+            self.assertEqual(crypto_registry.get_by_abbreviation("BTC"), self.bitcoin)
+            self.assertIsNone(crypto_registry.get("unsupported_crypto"))
+
+    def test_registry_is_updated_when_crypto_is_saved(self):
+        crypto_registry.all()
+
+        self.bitcoin.name = "bitcoin2"
+        self.bitcoin.save()
+
+        self.assertIsNone(crypto_registry.get("bitcoin"))
+        self.assertEqual(crypto_registry.get("bitcoin2"), self.bitcoin)
+
+    def test_registry_is_updated_when_crypto_is_deleted(self):
+        crypto_registry.all()
+
+        self.bitcoin.delete()
+
+        self.assertIsNone(crypto_registry.get("bitcoin"))
+        self.assertListEqual(crypto_registry.all(), [])
+
+    def test_registries_of_other_processes_reload_after_change(self):
+        other_registry = CryptoRegistry()
+        other_registry.all()
+
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        self.assertIsNotNone(other_registry.get("ethereum"))
+
+    @override_settings(CRYPTO_REGISTRY_MAX_AGE=0)
+    def test_registry_reloads_changes_of_processes_not_sharing_the_cache(self):
+        crypto_registry.all()
+        version = cache.get(CATALOG_VERSION_KEY)
+
+        # Like `manage.py loaddata` in another process: no signal reaches this one
+        Crypto.objects.filter(id=self.bitcoin.id).update(name="bitcoin2")
+
+        self.assertEqual(crypto_registry.get("bitcoin2"), self.bitcoin)
+        self.assertNotEqual(cache.get(CATALOG_VERSION_KEY), version)
+
+    @override_settings(CRYPTO_REGISTRY_MAX_AGE=0)
+    def test_reload_without_changes_keeps_version(self):
+        crypto_registry.all()
+        version = cache.get(CATALOG_VERSION_KEY)
+
+        crypto_registry.all()
+
+        self.assertEqual(cache.get(CATALOG_VERSION_KEY), version)
+
+    def test_list_cryptos_does_not_query_catalog_once_loaded(self):
+        client = Client()
+        user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        client.login(username=user.username, password="Test1234")
+
+        crypto_registry.all()
+
+        # Session and user lookup only
+        with self.assertNumQueries(2):
+            response = client.get(reverse("cryptos"))
+
+        self.assertEqual(len(response.json()["cryptos"]), 1)
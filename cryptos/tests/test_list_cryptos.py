@@ -24,10 +24,11 @@ class ListCryptosTestCase(TestCase):
         for crypto in self.expected_cryptos:
             Crypto.objects.create(**crypto)
 
-        user = User.objects.create_user(
+        self.user = User.objects.create_user(
             username="test", password="Test1234", email="test@test.com"
         )
-        self.client.login(username=user.username, password="Test1234")
+        self.client.login(username=self.user.username, password="Test1234")
+        self.async_client.force_login(self.user)
 
     def test_list_cryptos_returns_correct_data(self):
         response = self.client.get(reverse("cryptos"))
@@ -40,6 +41,29 @@ class ListCryptosTestCase(TestCase):
 
         self.assertListEqual(cryptos, self.expected_cryptos)
 
+    def test_list_cryptos_returns_not_modified_for_matching_etag(self):
+        response = self.client.get(reverse("cryptos"))
+        etag = response["ETag"]
+
+        # Session and user lookup only
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("cryptos"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_cryptos_etag_changes_when_catalog_changes(self):
+        etag = self.client.get(reverse("cryptos"))["ETag"]
+
+        Crypto.objects.create(
+            name="cardano", abbreviation="ADA", iconurl="https://test.com/test3.png"
+        )
+
+        response = self.client.get(reverse("cryptos"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["cryptos"]), 3)
+
     def test_list_cryptos_with_empty_result(self):
         Crypto.objects.all().delete()
         response = self.client.get(reverse("cryptos"))
@@ -58,3 +82,10 @@ class ListCryptosTestCase(TestCase):
 
         self.assertContains(response, "error", status_code=401)
         self.assertEqual(response["Content-Type"], "application/json")
+
+    async def test_list_cryptos_in_async_request(self):
+        response = await self.async_client.get(reverse("cryptos"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(response.json()["cryptos"], self.expected_cryptos)
+        self.assertIn("ETag", response)
@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto
+from cryptos.prices import aget_price, get_price, get_price_cache_stats
+
+
+class PriceCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _get_crypto_price(self, crypto):
+        response = self.client.get(reverse("crypto-price", kwargs={"crypto": crypto}))
+
+        return response
+
+    def _join_background_threads(self):
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and thread.daemon:
+                thread.join(timeout=5)
+
+    @patch("requests.Session.get")
+    def test_price_is_served_from_cache(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        for _ in range(3):
+            response = self._get_crypto_price("bitcoin")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["price"], "1000")
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertDictEqual(
+            get_price_cache_stats(),
+            {"hits": 2, "stale_hits": 0, "misses": 1, "coalesced": 0, "fallbacks": 0},
+        )
+
+    @patch("requests.Session.get")
+    def test_failed_fetch_is_not_cached(self, mock_request):
+        mock_request.return_value.status_code = 500
+
+        response = self._get_crypto_price("bitcoin")
+        self.assertEqual(response.status_code, 500)
+
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        response = self._get_crypto_price("bitcoin")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch("requests.Session.get")
+    def test_concurrent_misses_are_coalesced(self, mock_request):
+        def slow_response(*args, **kwargs):
+            time.sleep(0.2)
+            return mock_request.return_value
+
+        mock_request.side_effect = slow_response
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_price("BTCEUR")))
+            for _ in range(5)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([price.value for price in results], ["1000"] * 5)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertDictEqual(
+            get_price_cache_stats(),
+            {"hits": 0, "stale_hits": 0, "misses": 1, "coalesced": 4, "fallbacks": 0},
+        )
+
+    @patch("requests.Session.get")
+    async def test_concurrent_async_misses_wait_on_the_event_loop(self, mock_request):
+        def slow_response(*args, **kwargs):
+            threading.Event().wait(0.2)
+            return mock_request.return_value
+
+        mock_request.side_effect = slow_response
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        # Only the fetch runs in a thread, waiters poll the cache without sleeping one
+        with patch("cryptos.prices.time.sleep", side_effect=AssertionError):
+            results = await asyncio.gather(*[aget_price("BTCEUR") for _ in range(5)])
+
+        self.assertListEqual([price.value for price in results], ["1000"] * 5)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertDictEqual(
+            get_price_cache_stats(),
+            {"hits": 0, "stale_hits": 0, "misses": 1, "coalesced": 4, "fallbacks": 0},
+        )
+
+    @override_settings(PRICE_CACHE_TTL=0, PRICE_STALE_WHILE_REVALIDATE=30)
+    @patch("requests.Session.get")
+    def test_expired_price_is_served_stale_while_revalidating(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+        self._get_crypto_price("bitcoin")
+
+        mock_request.return_value.json.return_value = [
+            {"symbol": "BTCEUR", "price": "1100"}
+        ]
+
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["price"], "1000")
+        self.assertTrue(response.json()["stale"])
+
+        self._join_background_threads()
+
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertEqual(response.json()["price"], "1100")
+
+        self._join_background_threads()
+
+    @override_settings(PRICE_CACHE_TTL=0, PRICE_STALE_WHILE_REVALIDATE=30)
+    @patch("cryptos.prices.revalidate_in_background")
+    @patch("requests.Session.get")
+    def test_stale_price_is_revalidated_in_background(
+        self, mock_request, mock_revalidate
+    ):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+        self._get_crypto_price("bitcoin")
+
+        self._get_crypto_price("bitcoin")
+
+        mock_revalidate.assert_called_once_with(["BTCEUR"])
+        self.assertEqual(mock_request.call_count, 1)
+
+    @override_settings(
+        PRICE_CACHE_TTL=0, PRICE_STALE_WHILE_REVALIDATE=0, PRICE_MAX_STALENESS=300
+    )
+    @patch("requests.Session.get")
+    def test_last_price_is_served_stale_if_fetch_fails(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+        response = self._get_crypto_price("bitcoin")
+        as_of = response.json()["as_of"]
+
+        mock_request.side_effect = requests.Timeout()
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["price"], "1000")
+        self.assertTrue(response.json()["stale"])
+        self.assertEqual(response.json()["as_of"], as_of)
+        self.assertEqual(get_price_cache_stats()["fallbacks"], 1)
+
+    def test_staff_can_get_price_cache_stats(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(reverse("price-cache-stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertDictEqual(
+            response.json(),
+            {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "fallbacks": 0},
+        )
+
+    def test_non_staff_user_cannot_get_price_cache_stats(self):
+        response = self.client.get(reverse("price-cache-stats"))
+
+        self.assertContains(response, "error", status_code=403)
+        self.assertEqual(response["Content-Type"], "application/json")
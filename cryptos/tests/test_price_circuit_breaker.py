@@ -0,0 +1,199 @@
+from unittest.mock import patch
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from cryptos.models import Crypto
+from cryptos.providers import PriceFetchError, PriceUnavailableError
+
+
+def _fail():
+    raise PriceFetchError("upstream failed")
+
+
+class CircuitBreakerTestCase(TestCase):
+    def test_breaker_opens_when_error_rate_is_exceeded(self):
+        breaker = CircuitBreaker(min_calls=4, error_rate_threshold=0.5)
+
+        breaker.call(lambda: "1000")
+        breaker.call(lambda: "1000")
+
+        for _ in range(2):
+            with self.assertRaises(PriceFetchError):
+                breaker.call(_fail)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: "1000")
+
+    def test_breaker_opens_when_calls_are_slow(self):
+        breaker = CircuitBreaker(
+            min_calls=2, slow_call_duration=0, slow_call_rate_threshold=1
+        )
+
+        breaker.call(lambda: "1000")
+        breaker.call(lambda: "1000")
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_breaker_stays_closed_below_min_calls(self):
+        breaker = CircuitBreaker(min_calls=3)
+
+        for _ in range(2):
+            with self.assertRaises(PriceFetchError):
+                breaker.call(_fail)
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_client_errors_do_not_open_breaker(self):
+        breaker = CircuitBreaker(min_calls=2)
+
+        def fail_with(status_code):
+            raise PriceUnavailableError("upstream failed", status_code=status_code)
+
+        for _ in range(3):
+            with self.assertRaises(PriceUnavailableError):
+                breaker.call(fail_with, 400)
+
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+        for _ in range(3):
+            with self.assertRaises(PriceUnavailableError):
+                breaker.call(fail_with, 502)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_successful_probe_closes_breaker(self):
+        breaker = CircuitBreaker(min_calls=1, open_duration=0)
+
+        with self.assertRaises(PriceFetchError):
+            breaker.call(_fail)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.call(lambda: "1000"), "1000")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_outcome_of_call_admitted_before_state_change_is_ignored(self):
+        breaker = CircuitBreaker(min_calls=1, open_duration=0)
+
+        # A slow call of the closed breaker, which opens while it is in flight
+        generation = breaker._acquire()
+        with self.assertRaises(PriceFetchError):
+            breaker.call(_fail)
+
+        probe_generation = breaker._acquire()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker._record(generation, failed=False, duration=0)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker._record(probe_generation, failed=True, duration=0)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_failed_probe_reopens_breaker(self):
+        breaker = CircuitBreaker(min_calls=1, open_duration=0)
+
+        with self.assertRaises(PriceFetchError):
+            breaker.call(_fail)
+        with self.assertRaises(PriceFetchError):
+            breaker.call(_fail)
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+@override_settings(
+    PRICE_CIRCUIT_BREAKER={"min_calls": 1, "open_duration": 60},
+    PRICE_CACHE_TTL=0,
+    PRICE_STALE_WHILE_REVALIDATE=0,
+)
+class PriceCircuitBreakerViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _get_crypto_price(self, crypto):
+        response = self.client.get(reverse("crypto-price", kwargs={"crypto": crypto}))
+
+        return response
+
+    @patch("requests.Session.get")
+    def test_open_breaker_fails_fast(self, mock_request):
+        mock_request.side_effect = requests.Timeout()
+
+        response = self._get_crypto_price("bitcoin")
+        self.assertEqual(response.status_code, 504)
+
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertContains(response, "error", status_code=503)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("Retry-After", response)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch("requests.Session.get")
+    def test_open_breaker_serves_last_known_price(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+        self._get_crypto_price("bitcoin")
+
+        mock_request.return_value.status_code = 500
+        self._get_crypto_price("bitcoin")
+
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["price"], "1000")
+        self.assertEqual(mock_request.call_count, 2)
+
+    @override_settings(PRICE_MAX_STALENESS=0)
+    @patch("requests.Session.get")
+    def test_open_breaker_does_not_serve_stale_price_if_disabled(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+        self._get_crypto_price("bitcoin")
+
+        mock_request.return_value.status_code = 500
+        self._get_crypto_price("bitcoin")
+
+        response = self._get_crypto_price("bitcoin")
+
+        self.assertContains(response, "error", status_code=503)
+
+    @patch("requests.Session.get")
+    def test_invalid_symbol_does_not_open_breaker(self, mock_request):
+        mock_request.return_value.status_code = 400
+
+        for _ in range(3):
+            self._get_crypto_price("bitcoin")
+
+        self.assertEqual(get_breaker().state, CircuitBreaker.CLOSED)
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_staff_can_get_circuit_breaker_state(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(reverse("price-circuit-breaker"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["state"], "closed")
+
+    def test_non_staff_user_cannot_get_circuit_breaker_state(self):
+        response = self.client.get(reverse("price-circuit-breaker"))
+
+        self.assertContains(response, "error", status_code=403)
@@ -0,0 +1,263 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.history import prune_price_history, roll_up_price_ticks
+from cryptos.models import Crypto, PriceCandle, PriceTick
+from cryptos.registry import crypto_registry
+
+START = datetime(2023, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class PriceRollupTestCase(TestCase):
+    def setUp(self):
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+    def _record(self, *ticks):
+        PriceTick.objects.bulk_create(
+            PriceTick(crypto=self.bitcoin, price=price, recorded_at=START + offset)
+            for offset, price in ticks
+        )
+
+    def _candles(self, interval):
+        return list(
+            PriceCandle.objects.filter(interval=interval)
+            .order_by("bucket_start")
+            .values_list("bucket_start", "open", "high", "low", "close")
+        )
+
+    def test_roll_up_ticks_into_candles(self):
+        self._record(
+            (timedelta(seconds=0), 100),
+            (timedelta(seconds=20), 120),
+            (timedelta(seconds=40), 90),
+            (timedelta(seconds=70), 110),
+        )
+
+        self.assertEqual(roll_up_price_ticks(), 4)
+
+        self.assertEqual(
+            self._candles("1m"),
+            [
+                (START, Decimal(100), Decimal(120), Decimal(90), Decimal(90)),
+                (
+                    START + timedelta(minutes=1),
+                    Decimal(110),
+                    Decimal(110),
+                    Decimal(110),
+                    Decimal(110),
+                ),
+            ],
+        )
+        self.assertEqual(
+            self._candles("1h"),
+            [(START, Decimal(100), Decimal(120), Decimal(90), Decimal(110))],
+        )
+        self.assertEqual(
+            self._candles("1d"),
+            [
+                (
+                    START.replace(hour=0),
+                    Decimal(100),
+                    Decimal(120),
+                    Decimal(90),
+                    Decimal(110),
+                )
+            ],
+        )
+
+    def test_roll_up_only_processes_new_ticks(self):
+        self._record((timedelta(seconds=0), 100), (timedelta(seconds=20), 120))
+        roll_up_price_ticks()
+
+        self._record((timedelta(seconds=40), 80), (timedelta(seconds=50), 95))
+
+        self.assertEqual(roll_up_price_ticks(), 2)
+        self.assertEqual(roll_up_price_ticks(), 0)
+
+        # Buckets of earlier runs keep their open price
+        self.assertEqual(
+            self._candles("1h"),
+            [(START, Decimal(100), Decimal(120), Decimal(80), Decimal(95))],
+        )
+
+    def test_roll_up_in_batches(self):
+        self._record(*((timedelta(minutes=i), 100 + i) for i in range(5)))
+
+        self.assertEqual(roll_up_price_ticks(batch_size=2), 5)
+
+        self.assertEqual(len(self._candles("1m")), 5)
+        self.assertEqual(
+            self._candles("1h"),
+            [(START, Decimal(100), Decimal(104), Decimal(100), Decimal(104))],
+        )
+
+    @override_settings(
+        PRICE_HISTORY_RETENTION={"tick": 3600, "1m": 86400, "1h": None, "1d": None}
+    )
+    def test_prune_price_history(self):
+        self._record((timedelta(0), 100), (timedelta(hours=2), 110))
+        roll_up_price_ticks()
+        self._record((timedelta(hours=2, minutes=1), 120))
+
+        deleted = prune_price_history(now=START + timedelta(days=1, minutes=30))
+
+        # The rolled up ticks and the first 1-minute candle are past their retention.
+        # The last tick was not rolled up yet, so it is kept.
+        self.assertEqual(deleted, 3)
+        self.assertEqual(PriceTick.objects.count(), 1)
+        self.assertEqual(len(self._candles("1m")), 1)
+        self.assertEqual(len(self._candles("1h")), 2)
+
+    def test_poll_prices_records_ticks(self):
+        with patch("requests.Session.get") as mock_request:
+            mock_request.return_value.status_code = 200
+            mock_request.return_value.json.return_value = [
+                {"symbol": "BTCEUR", "price": "1000"}
+            ]
+
+            call_command("poll_prices", "--once", stdout=StringIO())
+
+        self.assertEqual(
+            list(PriceTick.objects.values_list("crypto__name", "price")),
+            [("bitcoin", Decimal("1000"))],
+        )
+
+    @override_settings(
+        PRICE_HISTORY_RETENTION={"tick": None, "1m": None, "1h": None, "1d": None}
+    )
+    def test_rollup_prices_command(self):
+        self._record((timedelta(0), 100))
+        out = StringIO()
+
+        call_command("rollup_prices", stdout=out)
+
+        self.assertIn("Rolled up 1 price ticks", out.getvalue())
+        self.assertEqual(PriceCandle.objects.count(), 3)
+
+
+class CryptoHistoryTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+        self.bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+
+        PriceCandle.objects.bulk_create(
+            PriceCandle(
+                crypto=self.bitcoin,
+                interval="1h",
+                bucket_start=START + timedelta(hours=i),
+                open=100 + i,
+                high=110 + i,
+                low=90 + i,
+                close=101 + i,
+            )
+            for i in range(5)
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=self.user.username, password="Test1234")
+
+    def _get_history(self, crypto, **params):
+        return self.client.get(
+            reverse("crypto-history", kwargs={"crypto": crypto}), params
+        )
+
+    def test_get_history(self):
+        response = self._get_history(
+            "bitcoin",
+            interval="1h",
+            **{"from": "2023-06-01T13:00:00Z", "to": "2023-06-01T14:00:00Z"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "crypto_name": "bitcoin",
+                "interval": "1h",
+                "unit": "EUR",
+                "candles": [
+                    {
+                        "start": "2023-06-01T13:00:00+00:00",
+                        "open": "101.00000000",
+                        "high": "111.00000000",
+                        "low": "91.00000000",
+                        "close": "102.00000000",
+                    },
+                    {
+                        "start": "2023-06-01T14:00:00+00:00",
+                        "open": "102.00000000",
+                        "high": "112.00000000",
+                        "low": "92.00000000",
+                        "close": "103.00000000",
+                    },
+                ],
+            },
+        )
+
+    def test_get_history_defaults_to_latest_hourly_candles(self):
+        with patch(
+            "cryptos.views.django_timezone.now",
+            return_value=START + timedelta(hours=10),
+        ):
+            response = self._get_history("bitcoin")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["candles"]), 5)
+
+    def test_get_history_with_single_query(self):
+        crypto_registry.all()
+
+        with self.assertNumQueries(3):
+            response = self._get_history(
+                "bitcoin",
+                **{"from": "2023-01-01T00:00:00", "to": "2023-12-31T00:00:00"},
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_history_of_unsupported_crypto(self):
+        response = self._get_history("unknown")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_history_with_invalid_parameters(self):
+        self.assertEqual(self._get_history("bitcoin", interval="5m").status_code, 400)
+        self.assertEqual(
+            self._get_history("bitcoin", **{"from": "yesterday"}).status_code, 400
+        )
+        self.assertEqual(
+            self._get_history(
+                "bitcoin",
+                **{"from": "2023-06-02T00:00:00Z", "to": "2023-06-01T00:00:00Z"},
+            ).status_code,
+            400,
+        )
+
+    def test_get_history_with_too_large_range(self):
+        response = self._get_history(
+            "bitcoin",
+            interval="1m",
+            **{"from": "2023-01-01T00:00:00Z", "to": "2023-12-31T00:00:00Z"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_history_requires_login(self):
+        self.client.logout()
+
+        response = self._get_history("bitcoin")
+
+        self.assertEqual(response.status_code, 401)
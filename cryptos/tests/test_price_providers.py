@@ -0,0 +1,114 @@
+import json
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from cryptos.breaker import get_breaker
+from cryptos.models import Crypto
+from cryptos.providers import (
+    BinancePriceProvider,
+    PriceUnavailableError,
+    StubPriceProvider,
+    get_provider,
+)
+
+STUB_PROVIDER = {
+    "BACKEND": "cryptos.providers.StubPriceProvider",
+    "OPTIONS": {"prices": {"BTCEUR": "1000", "ETHEUR": "100"}},
+}
+
+
+class BinancePriceProviderTestCase(TestCase):
+    @patch("requests.Session.get")
+    def test_requests_use_connect_and_read_timeout(self, mock_request):
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = {"price": "1000"}
+
+        provider = BinancePriceProvider(connect_timeout=1, read_timeout=4)
+
+        self.assertEqual(provider.fetch_price("BTCEUR"), "1000")
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (1, 4))
+
+    def test_connection_pool_is_sized(self):
+        provider = BinancePriceProvider(pool_size=25)
+        adapter = provider.session.get_adapter(provider.ticker_url)
+
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    def test_provider_is_created_once_per_process(self):
+        self.assertIs(get_provider(), get_provider())
+
+
+class StubPriceProviderTestCase(TestCase):
+    def test_fetch_prices_from_dict(self):
+        provider = StubPriceProvider(prices={"BTCEUR": "1000"})
+
+        self.assertEqual(provider.fetch_price("BTCEUR"), "1000")
+        self.assertDictEqual(
+            provider.fetch_prices(["BTCEUR", "ETHEUR"]), {"BTCEUR": "1000"}
+        )
+
+        with self.assertRaises(PriceUnavailableError):
+            provider.fetch_price("ETHEUR")
+
+    def test_fetch_prices_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+            json.dump({"BTCEUR": "1000"}, file)
+            file.flush()
+
+            provider = StubPriceProvider(path=file.name)
+
+        self.assertEqual(provider.fetch_price("BTCEUR"), "1000")
+
+
+@override_settings(PRICE_PROVIDER=STUB_PROVIDER)
+class StubProviderPriceViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        get_breaker().reset()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=user.username, password="Test1234")
+
+    @patch("requests.Session.get")
+    def test_get_crypto_price_from_stub_provider(self, mock_request):
+        response = self.client.get(
+            reverse("crypto-price", kwargs={"crypto": "bitcoin"})
+        )
+
+        expected_json = {
+            "crypto_name": "bitcoin",
+            "price": "1000",
+            "unit": "EUR",
+            "stale": False,
+        }
+
+        self.assertEqual(response.status_code, 200)
+        json_data = response.json()
+        self.assertIn("as_of", json_data)
+        json_data.pop("as_of")
+        self.assertDictEqual(json_data, expected_json)
+        mock_request.assert_not_called()
+
+    @patch("requests.Session.get")
+    def test_get_crypto_prices_from_stub_provider(self, mock_request):
+        response = self.client.get(reverse("crypto-prices"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            [price["price"] for price in response.json()["prices"]], ["1000", "100"]
+        )
+        mock_request.assert_not_called()
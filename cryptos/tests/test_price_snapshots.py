@@ -0,0 +1,144 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from cryptos.models import Crypto, PriceSnapshot
+from cryptos.registry import crypto_registry
+
+
+class PollPricesTestCase(TestCase):
+    def setUp(self):
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+    def _poll_prices(self, tickers):
+        with patch("requests.Session.get") as mock_request:
+            mock_request.return_value.status_code = 200
+            mock_request.return_value.json.return_value = [
+                {"symbol": symbol, "price": price} for symbol, price in tickers.items()
+            ]
+
+            out = StringIO()
+            call_command("poll_prices", "--once", stdout=out)
+
+        return mock_request, out.getvalue()
+
+    def test_poll_prices_creates_snapshots(self):
+        mock_request, output = self._poll_prices({"BTCEUR": "1000", "ETHEUR": "100"})
+
+        mock_request.assert_called_once()
+        self.assertIn("Updated 2 price snapshots", output)
+
+        prices = dict(PriceSnapshot.objects.values_list("crypto__name", "price"))
+        self.assertDictEqual(
+            prices, {"bitcoin": Decimal("1000"), "ethereum": Decimal("100")}
+        )
+
+    def test_poll_prices_updates_existing_snapshots(self):
+        self._poll_prices({"BTCEUR": "1000", "ETHEUR": "100"})
+        self._poll_prices({"BTCEUR": "1200", "ETHEUR": "110"})
+
+        self.assertEqual(PriceSnapshot.objects.count(), 2)
+
+        snapshot = PriceSnapshot.objects.get(crypto__name="bitcoin")
+        self.assertEqual(snapshot.price, Decimal("1200"))
+
+    def test_poll_prices_survives_upstream_failure(self):
+        with patch("requests.Session.get") as mock_request:
+            mock_request.return_value.status_code = 500
+
+            err = StringIO()
+            call_command("poll_prices", "--once", stderr=err)
+
+        self.assertIn("Could not fetch prices", err.getvalue())
+        self.assertFalse(PriceSnapshot.objects.exists())
+
+
+@override_settings(PRICE_SOURCE="snapshot")
+class SnapshotPriceViewsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+        bitcoin = Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        self.fetched_at = timezone.now() - timedelta(seconds=30)
+        PriceSnapshot.objects.create(
+            crypto=bitcoin, price="1000.5", fetched_at=self.fetched_at
+        )
+
+        user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.client.login(username=user.username, password="Test1234")
+
+    @patch("requests.Session.get")
+    def test_get_crypto_price_from_snapshot(self, mock_request):
+        crypto_registry.all()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse("crypto-price", kwargs={"crypto": "bitcoin"})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+        json_data = response.json()
+
+        self.assertEqual(json_data["crypto_name"], "bitcoin")
+        self.assertEqual(Decimal(json_data["price"]), Decimal("1000.5"))
+        self.assertEqual(json_data["unit"], "EUR")
+        self.assertEqual(json_data["as_of"], self.fetched_at.isoformat())
+        self.assertGreaterEqual(json_data["age"], 30)
+        mock_request.assert_not_called()
+
+    def test_get_crypto_price_fails_if_no_snapshot_exists(self):
+        response = self.client.get(
+            reverse("crypto-price", kwargs={"crypto": "ethereum"})
+        )
+
+        self.assertContains(response, "error", status_code=503)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_get_crypto_price_fails_for_unsupported_crypto(self):
+        response = self.client.get(
+            reverse("crypto-price", kwargs={"crypto": "unsupported_crypto"})
+        )
+
+        self.assertContains(response, "error", status_code=404)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    @patch("requests.Session.get")
+    def test_get_crypto_prices_from_snapshots(self, mock_request):
+        response = self.client.get(reverse("crypto-prices"))
+
+        self.assertEqual(response.status_code, 200)
+
+        prices = response.json()["prices"]
+
+        self.assertEqual(len(prices), 1)
+        self.assertEqual(prices[0]["crypto_name"], "bitcoin")
+        mock_request.assert_not_called()
+
+    def test_get_crypto_prices_fails_if_snapshot_is_missing(self):
+        response = self.client.get(
+            reverse("crypto-prices"), {"names": "bitcoin,ethereum"}
+        )
+
+        self.assertContains(response, "error", status_code=503)
+        self.assertEqual(response["Content-Type"], "application/json")
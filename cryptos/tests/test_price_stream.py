@@ -0,0 +1,215 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import reverse
+
+from auth.tokens import issue_tokens
+from cryptos.models import Crypto
+from cryptos.prices import Price
+from cryptos.stream import (
+    PriceBroadcaster,
+    StreamDisconnectMiddleware,
+    get_broadcaster,
+    price_events,
+)
+
+
+def _prices(values):
+    return {
+        symbol: Price(value, time.time(), False) for symbol, value in values.items()
+    }
+
+
+@override_settings(
+    PRICE_STREAM_INTERVAL=0.01, PRICE_STREAM_QUEUE_SIZE=2, PRICE_STREAM_HEARTBEAT=10
+)
+class PriceBroadcasterTestCase(TestCase):
+    async def test_one_poll_is_shared_by_all_subscriptions(self):
+        broadcaster = PriceBroadcaster()
+
+        with patch(
+            "cryptos.stream.get_prices",
+            return_value=_prices({"BTCEUR": 1000.0, "ETHEUR": 100.0}),
+        ) as mock_get_prices:
+            first = broadcaster.subscribe({"BTCEUR": "bitcoin"})
+            second = broadcaster.subscribe({"BTCEUR": "bitcoin", "ETHEUR": "ethereum"})
+
+            self.assertEqual((await first.queue.get())[0], "BTCEUR")
+            received = {(await second.queue.get())[0] for _ in range(2)}
+
+            broadcaster.unsubscribe(first)
+            broadcaster.unsubscribe(second)
+
+        self.assertEqual(received, {"BTCEUR", "ETHEUR"})
+        self.assertEqual(
+            set(mock_get_prices.call_args_list[0].args[0]), {"BTCEUR", "ETHEUR"}
+        )
+        self.assertIsNone(broadcaster._task)
+
+    async def test_only_changed_prices_are_broadcast(self):
+        broadcaster = PriceBroadcaster()
+
+        with patch(
+            "cryptos.stream.get_prices", return_value=_prices({"BTCEUR": 1000.0})
+        ) as mock_get_prices:
+            subscription = broadcaster.subscribe({"BTCEUR": "bitcoin"})
+            await subscription.queue.get()
+
+            while mock_get_prices.call_count < 3:
+                await asyncio.sleep(0.01)
+
+            broadcaster.unsubscribe(subscription)
+
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_new_subscription_gets_latest_prices(self):
+        broadcaster = PriceBroadcaster()
+        broadcaster.latest = _prices({"BTCEUR": 1000.0})
+
+        with patch("cryptos.stream.get_prices", return_value={}):
+            subscription = broadcaster.subscribe({"BTCEUR": "bitcoin"})
+            broadcaster.unsubscribe(subscription)
+
+        symbol, price = subscription.queue.get_nowait()
+        self.assertEqual((symbol, price.value), ("BTCEUR", 1000.0))
+
+    async def test_slow_subscription_is_dropped(self):
+        broadcaster = PriceBroadcaster()
+        values = iter(range(100))
+
+        with patch(
+            "cryptos.stream.get_prices",
+            side_effect=lambda symbols: _prices({"BTCEUR": float(next(values))}),
+        ):
+            slow = broadcaster.subscribe({"BTCEUR": "bitcoin"})
+
+            while not slow.dropped:
+                await asyncio.sleep(0.01)
+
+        self.assertNotIn(slow, broadcaster.subscriptions)
+        self.assertIsNone(broadcaster._task)
+
+
+@override_settings(PRICE_STREAM_INTERVAL=0.01, PRICE_STREAM_HEARTBEAT=0.05)
+class CryptoPriceStreamViewTestCase(TestCase):
+    def setUp(self):
+        self.async_client = AsyncClient()
+
+        Crypto.objects.create(
+            name="bitcoin", abbreviation="BTC", iconurl="https://test.com/test1.png"
+        )
+        Crypto.objects.create(
+            name="ethereum", abbreviation="ETH", iconurl="https://test.com/test2.png"
+        )
+
+        self.user = User.objects.create_user(
+            username="test", password="Test1234", email="test@test.com"
+        )
+        self.async_client.force_login(self.user)
+
+    async def _stream(self, **params):
+        return await self.async_client.get(reverse("crypto-stream"), params)
+
+    async def test_stream_prices(self):
+        with patch(
+            "cryptos.stream.get_prices", return_value=_prices({"BTCEUR": 1000.0})
+        ):
+            response = await self._stream(names="bitcoin")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+
+            events = aiter(response.streaming_content)
+            self.assertEqual(await anext(events), b"retry: 5000\n\n")
+
+            event = (await anext(events)).decode()
+            self.assertTrue(event.startswith("event: price\ndata: "))
+
+            data = json.loads(event.splitlines()[1][len("data: ") :])
+            self.assertEqual(data["crypto_name"], "bitcoin")
+            self.assertEqual(data["price"], 1000.0)
+
+            # No changes, so the next event is a heartbeat
+            self.assertEqual(await anext(events), b": heartbeat\n\n")
+
+    async def test_closed_stream_unsubscribes(self):
+        with patch(
+            "cryptos.stream.get_prices", return_value=_prices({"BTCEUR": 1000.0})
+        ):
+            events = price_events({"BTCEUR": "bitcoin"})
+            await anext(events)
+            await anext(events)
+
+            self.assertEqual(len(get_broadcaster().subscriptions), 1)
+
+            await events.aclose()
+
+        self.assertEqual(get_broadcaster().subscriptions, set())
+
+    async def test_disconnected_client_unsubscribes(self):
+        application = StreamDisconnectMiddleware(get_asgi_application())
+        token = issue_tokens(self.user)["access_token"]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": reverse("crypto-stream"),
+            "root_path": "",
+            "query_string": b"names=bitcoin",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = asyncio.Queue()
+        await messages.put({"type": "http.request", "body": b"", "more_body": False})
+        bodies = []
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                bodies.append(message["body"])
+                # The client closes the stream after the first event
+                await messages.put({"type": "http.disconnect"})
+
+        # Like the test client, keep the connection of the test transaction open
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with patch(
+                "cryptos.stream.get_prices", return_value=_prices({"BTCEUR": 1000.0})
+            ):
+                await asyncio.wait_for(application(scope, messages.get, send), 5)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        self.assertEqual(bodies[0], b"retry: 5000\n\n")
+        self.assertEqual(get_broadcaster().subscriptions, set())
+
+    async def test_stream_prices_of_unsupported_crypto(self):
+        response = await self._stream(names="bitcoin,unknown")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"error": "Crypto unknown is not supported"})
+
+    async def test_stream_prices_requires_login(self):
+        response = await AsyncClient().get(
+            reverse("crypto-stream"), {"names": "bitcoin"}
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_prices_requires_asgi(self):
+        client = Client()
+        client.force_login(self.user)
+
+        response = client.get(reverse("crypto-stream"), {"names": "bitcoin"})
+
+        self.assertEqual(response.status_code, 501)
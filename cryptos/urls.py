@@ -9,4 +9,21 @@ urlpatterns = [
         views.CryptoPriceView.as_view(),
         name="crypto-price",
     ),
+    path(
+        "cryptos/<str:crypto>/history",
+        views.CryptoHistoryView.as_view(),
+        name="crypto-history",
+    ),
+    path("cryptos/stream", views.CryptoPriceStreamView.as_view(), name="crypto-stream"),
+    path("cryptos/prices", views.CryptoPricesView.as_view(), name="crypto-prices"),
+    path(
+        "cryptos/price-cache/stats",
+        views.PriceCacheStatsView.as_view(),
+        name="price-cache-stats",
+    ),
+    path(
+        "cryptos/price-circuit-breaker",
+        views.PriceCircuitBreakerView.as_view(),
+        name="price-circuit-breaker",
+    ),
 ]
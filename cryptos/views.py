@@ -1,58 +1,258 @@
-import requests
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone as django_timezone
 from django.views import View
-from django.views.decorators.http import require_http_methods
 
-from crypto_assets_server.mixins import CustomLoginRequiredMixin
-from .models import Crypto
+from crypto_assets_server.dates import parse_aware_datetime
+from crypto_assets_server.decorators import async_condition
+from crypto_assets_server.mixins import CustomLoginRequiredMixin, StaffRequiredMixin
+from .breaker import get_breaker
+from .errors import NoPriceSnapshotErrorResponse, PriceErrorResponse
+from .history import CANDLE_INTERVALS, history_data
+from .models import PriceCandle, PriceSnapshot
+from .prices import (
+    aget_price,
+    get_price_cache_stats,
+    get_prices,
+    price_data,
+    price_symbol,
+)
+from .providers import PriceFetchError
+from .registry import crypto_registry
+from .snapshots import snapshot_data
+from .stream import price_events
+
+# Number of candles returned by the history endpoint if `from` is not given
+DEFAULT_HISTORY_CANDLES = 100
+
+
+async def _catalog_etag(request, *args, **kwargs):
+    return f"cryptos-{await crypto_registry.aversion()}"
 
 
 class CryptoListView(CustomLoginRequiredMixin, View):
-    def get(self, *args, **kwargs):
-        queryset = Crypto.objects.values("name", "abbreviation", "iconurl")
-        result = list(queryset)
+    query_budget = 3
+
+    @async_condition(etag_func=_catalog_etag)
+    async def get(self, *args, **kwargs):
+        result = [
+            {
+                "name": crypto.name,
+                "abbreviation": crypto.abbreviation,
+                "iconurl": crypto.iconurl,
+            }
+            for crypto in await crypto_registry.aall()
+        ]
 
         return JsonResponse({"cryptos": result})
 
 
 class CryptoPriceView(CustomLoginRequiredMixin, View):
-    def get(self, *args, **kwargs):
+    query_budget = 4
+
+    async def get(self, *args, **kwargs):
         crypto_name = kwargs.get("crypto")
 
+        crypto = await crypto_registry.aget(crypto_name)
+        if crypto is None:
+            return _unsupported_crypto_response(crypto_name)
+
+        if settings.PRICE_SOURCE == "snapshot":
+            return await self._get_from_snapshot(crypto)
+
+        try:
+            price = await aget_price(price_symbol(crypto.abbreviation))
+        except PriceFetchError as err:
+            return PriceErrorResponse(err, f"the price of crypto {crypto_name}")
+
+        return JsonResponse(price_data(crypto_name, price))
+
+    async def _get_from_snapshot(self, crypto):
+        snapshot = (
+            await PriceSnapshot.objects.filter(crypto_id=crypto.id)
+            .values_list("price", "fetched_at")
+            .afirst()
+        )
+
+        if snapshot is None:
+            return NoPriceSnapshotErrorResponse([crypto.name])
+
+        return JsonResponse(snapshot_data(crypto.name, *snapshot))
+
+
+class CryptoPricesView(CustomLoginRequiredMixin, View):
+    query_budget = 4
+
+    def get(self, request, *args, **kwargs):
+        names = request.GET.get("names")
+
+        cryptos, err = _resolve_cryptos(names)
+        if err is not None:
+            return err
+
+        if settings.PRICE_SOURCE == "snapshot":
+            return self._get_from_snapshots(cryptos, all_cryptos=names is None)
+
+        symbols = [price_symbol(crypto.abbreviation) for crypto in cryptos]
+
         try:
-            crypto = Crypto.objects.get(name=crypto_name)
-        except Crypto.DoesNotExist:
+            prices = get_prices(symbols)
+        except PriceFetchError as err:
+            return PriceErrorResponse(err, "the prices of cryptos")
+
+        result = [
+            price_data(crypto.name, prices[symbol])
+            for crypto, symbol in zip(cryptos, symbols)
+        ]
+
+        return JsonResponse({"prices": result})
+
+    def _get_from_snapshots(self, cryptos, all_cryptos):
+        snapshots = {
+            crypto_id: (price, fetched_at)
+            for crypto_id, price, fetched_at in PriceSnapshot.objects.filter(
+                crypto_id__in=[crypto.id for crypto in cryptos]
+            ).values_list("crypto_id", "price", "fetched_at")
+        }
+
+        if all_cryptos:
+            # Cryptos without a snapshot yet are left out of the complete list
+            cryptos = [crypto for crypto in cryptos if crypto.id in snapshots]
+
+        missing = [crypto.name for crypto in cryptos if crypto.id not in snapshots]
+        if missing:
+            return NoPriceSnapshotErrorResponse(missing)
+
+        result = [
+            snapshot_data(crypto.name, *snapshots[crypto.id]) for crypto in cryptos
+        ]
+
+        return JsonResponse({"prices": result})
+
+
+class CryptoHistoryView(CustomLoginRequiredMixin, View):
+    query_budget = 4
+
+    def get(self, request, *args, **kwargs):
+        crypto_name = kwargs.get("crypto")
+
+        crypto = crypto_registry.get(crypto_name)
+        if crypto is None:
+            return _unsupported_crypto_response(crypto_name)
+
+        interval = request.GET.get("interval", PriceCandle.INTERVAL_HOUR)
+        if interval not in CANDLE_INTERVALS:
             return JsonResponse(
-                {"error": f"Crypto {crypto_name} is not supported"}, status=404
+                {"error": f"Interval must be one of {', '.join(CANDLE_INTERVALS)}"},
+                status=400,
             )
 
-        symbol = crypto.abbreviation + "EUR"
-        url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
-
         try:
-            response = requests.get(url, timeout=5)
-        except requests.Timeout:
+            end = parse_aware_datetime(request.GET.get("to")) or django_timezone.now()
+            start = parse_aware_datetime(request.GET.get("from"))
+        except ValueError:
             return JsonResponse(
-                {
-                    "error": f"Timeout occurred while fetching the price of crypto {crypto_name}"
-                },
-                status=504,
+                {"error": "from and to must be ISO 8601 datetimes"}, status=400
             )
-        except requests.RequestException as err:
+
+        if start is None:
+            start = end - DEFAULT_HISTORY_CANDLES * CANDLE_INTERVALS[interval]
+
+        if start > end:
+            return JsonResponse({"error": "from must not be after to"}, status=400)
+
+        if (end - start) / CANDLE_INTERVALS[
+            interval
+        ] > settings.PRICE_HISTORY_MAX_CANDLES:
             return JsonResponse(
                 {
-                    "error": f"An error occurred while fetching the price of crypto {crypto_name}: {str(err)}"
+                    "error": f"Range exceeds {settings.PRICE_HISTORY_MAX_CANDLES} "
+                    f"candles, use a larger interval"
                 },
-                status=500,
+                status=400,
             )
 
-        if response.status_code != 200:
+        candles = (
+            PriceCandle.objects.filter(
+                crypto_id=crypto.id,
+                interval=interval,
+                bucket_start__gte=start,
+                bucket_start__lte=end,
+            )
+            .order_by("bucket_start")
+            .values_list("bucket_start", "open", "high", "low", "close")
+        )
+
+        return JsonResponse(history_data(crypto.name, interval, candles))
+
+
+class CryptoPriceStreamView(CustomLoginRequiredMixin, View):
+    query_budget = 3
+
+    async def get(self, request, *args, **kwargs):
+        # Under WSGI, the endless stream would be consumed into memory before sending
+        if not isinstance(request, ASGIRequest):
             return JsonResponse(
-                {"error": f"Could not determine price of crypto {crypto_name}"},
-                status=500,
+                {"error": "Price stream is only served by an ASGI server"}, status=501
             )
 
-        json_data = response.json()
-        price = json_data["price"]
+        cryptos, err = await sync_to_async(_resolve_cryptos)(request.GET.get("names"))
+        if err is not None:
+            return err
+
+        symbols = {price_symbol(crypto.abbreviation): crypto.name for crypto in cryptos}
+
+        response = StreamingHttpResponse(
+            price_events(symbols), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Keeps nginx from buffering the events
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+
+class PriceCacheStatsView(CustomLoginRequiredMixin, StaffRequiredMixin, View):
+    query_budget = 2
+
+    def get(self, *args, **kwargs):
+        return JsonResponse(get_price_cache_stats())
+
+
+class PriceCircuitBreakerView(CustomLoginRequiredMixin, StaffRequiredMixin, View):
+    query_budget = 2
+
+    def get(self, *args, **kwargs):
+        return JsonResponse(get_breaker().stats())
+
+
+def _resolve_cryptos(names):
+    """
+    Returns the cryptos of the comma-separated names, or all cryptos if names is None,
+    together with an error response if any of them is not supported.
+    """
+    if names is None:
+        return crypto_registry.all(), None
+
+    names = list(dict.fromkeys(name for name in names.split(",") if name))
+    if not names:
+        return None, JsonResponse({"error": "No crypto names given"}, status=400)
+
+    cryptos = [crypto_registry.get(name) for name in names]
+
+    unsupported = [name for name, crypto in zip(names, cryptos) if crypto is None]
+    if unsupported:
+        return None, _unsupported_crypto_response(*unsupported)
+
+    return cryptos, None
+
+
+def _unsupported_crypto_response(*crypto_names):
+    if len(crypto_names) == 1:
+        error = f"Crypto {crypto_names[0]} is not supported"
+    else:
+        error = f"Cryptos {', '.join(crypto_names)} are not supported"
 
-        return JsonResponse({"crypto_name": crypto_name, "price": price, "unit": "EUR"})
+    return JsonResponse({"error": error}, status=404)